@@ -0,0 +1,58 @@
+# bench_catalog_load.py
+#
+# Times species_catalog on a synthetic catalog: a cold load (parse the CSV
+# and write the snapshot), a warm load (read the snapshot) and building the
+# column arrays.
+#
+# Run from the repository root:
+#     python benchmarks/bench_catalog_load.py [--rows N]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import species_catalog  # noqa: E402
+
+TYPES = ["Grass", "Fire", "Water", "Bug", "Normal", "Dark", "Psychic", "Steel"]
+
+
+def write_catalog(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(",".join(species_catalog.CSV_HEADER) + "\n")
+        for i in range(1, rows + 1):
+            f.write(f"{i},Species{i},{TYPES[i % len(TYPES)]},{40 + i % 100},"
+                    f"{30 + i % 120},{'TRUE' if i % 3 else 'FALSE'}\n")
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28} {time.perf_counter() - start:8.3f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "catalog.csv")
+        write_catalog(path, args.rows)
+        print(f"--- {args.rows:,} rows, {os.path.getsize(path) / 1e6:.1f} MB, "
+              f"NumPy {'on' if species_catalog.optional_numpy() is not None else 'off'} ---")
+
+        timed("parse CSV (no snapshot)", lambda: species_catalog.load_species_catalog(path, use_snapshot=False))
+        timed("cold load (parse + save)", lambda: species_catalog.load_species_catalog(path))
+        data_list = timed("warm load (snapshot)", lambda: species_catalog.load_species_catalog(path))
+        os.utime(path)
+        timed("touched CSV (hash check)", lambda: species_catalog.load_species_catalog(path))
+        timed("column arrays", lambda: species_catalog.species_columns(data_list))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# bench_import.py
+#
+# Measures what importing ex7 costs, compared with starting a bare
+# interpreter, and how long the first catalog access takes after that.
+# Each case runs in a fresh interpreter from a temporary directory, so
+# the catalog path must resolve relative to the package, not the cwd.
+#
+# Run from the repository root:
+#     python benchmarks/bench_import.py [--runs N]
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ("bare interpreter", "pass"),
+    ("import ex7", "import ex7"),
+    ("import ex7 + catalog", "import ex7; ex7.get_catalog()"),
+]
+
+
+def time_case(code, runs, cwd):
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    # One discarded run to write bytecode caches and the catalog snapshot
+    subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, check=True)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, check=True)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cwd:
+        results = {label: time_case(code, args.runs, cwd) for label, code in CASES}
+
+    bare = statistics.median(results["bare interpreter"])
+    for label, samples in results.items():
+        median = statistics.median(samples)
+        print(f"{label:<22} median {median * 1000:7.1f} ms   "
+              f"(+{(median - bare) * 1000:6.1f} ms over bare)")
+
+
+if __name__ == "__main__":
+    main()
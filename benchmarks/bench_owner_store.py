@@ -0,0 +1,243 @@
+# bench_owner_store.py
+#
+# Stress test for ex7.OwnerStore: N threads run a mixed workload (lookups,
+# catches, releases, evolutions, new and deleted owners) against one shared store, then
+# the tree, the ranking, the statistics and every Pokedex are checked for
+# consistency. Before that, randomized checks run the ranking and the store
+# with tiny SortedBlockList blocks (so blocks split and empty all the time)
+# against sorted() and brute force.
+#
+# CPython runs one thread at a time, so throughput is not expected to grow
+# with the thread count; the point is that it holds steady and nothing breaks.
+#
+# Run from the repository root:
+#     python benchmarks/bench_owner_store.py [--owners N] [--ops N] [--threads 1,2,4,8] [--seed N]
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+from bisect import bisect_left
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ex7  # noqa: E402
+from sorted_blocks import SortedBlockList  # noqa: E402
+
+TINY_LOAD = 3
+
+
+def node_height(node):
+    return node["height"] if node is not None else 0
+
+
+def check_store(store):
+    """Raises AssertionError if the store is inconsistent; returns the owner count."""
+    nodes = []
+    stack = [(store.root, None, None)]
+    while stack:
+        node, low, high = stack.pop()
+        if node is None:
+            continue
+        key = node["owner_lower"]
+        assert (low is None or low < key) and (high is None or key < high), "BST order broken"
+        left, right = node_height(node["left"]), node_height(node["right"])
+        assert node["height"] == 1 + max(left, right), "stale height"
+        assert abs(left - right) <= 1, "tree out of balance"
+        nodes.append(node)
+        stack.append((node["left"], low, key))
+        stack.append((node["right"], key, high))
+
+    expected = sorted((len(node["pokedex"]), node["owner_lower"], id(node)) for node in nodes)
+    actual = [(size, name, id(node)) for size, name, node in store.ranking]
+    assert actual == expected, "ranking does not match the Pokedexes"
+    check_blocks(store.ranking)
+    by_size = sorted(nodes, key=lambda node: (-len(node["pokedex"]), node["owner_lower"]))
+    for n in (0, 1, 10, len(nodes) + 1):
+        assert list(map(id, store.top_owners(n))) == list(map(id, by_size[:n])), "top owners differ"
+    for node in nodes:
+        assert all(poke_id == poke.id for poke_id, poke in node["pokedex"].items()), "bad Pokedex entry"
+    assert store.verify_statistics(), "statistics do not match the Pokedexes"
+    check_stat_index(store, nodes)
+    return len(nodes)
+
+
+def check_blocks(blocks):
+    """Raises AssertionError if a SortedBlockList's blocks, block maxes or size are off."""
+    assert len(blocks.maxes) == len(blocks.blocks), "one max per block"
+    for block, block_max in zip(blocks.blocks, blocks.maxes):
+        assert 0 < len(block) <= 2 * blocks.LOAD, "empty or oversized block"
+        assert blocks.key_of(block[-1]) == block_max, "stale block max"
+    keys = [blocks.key_of(item) for item in blocks]
+    assert all(a < b for a, b in zip(keys, keys[1:])), "items out of order"
+    assert len(keys) == len(blocks), "stale size"
+    assert list(reversed(blocks)) == list(blocks)[::-1], "reversed() differs"
+
+
+def pair_ids(pairs):
+    return [(id(node), poke.id) for node, poke in pairs]
+
+
+def check_stat_index(store, nodes):
+    """strongest() and stat_range() against sorting every owned Pokemon."""
+    for holders in store.stat_index.holders.values():
+        check_blocks(holders)
+    pairs = [(node, poke) for node in nodes for poke in node["pokedex"].values()]
+    for stat in ex7.STATS:
+        def by_stat(pair):
+            return getattr(pair[1], stat), pair[1].id, pair[0]["owner_lower"]
+
+        best = sorted(pairs, key=lambda pair: (-by_stat(pair)[0], *by_stat(pair)[1:]))
+        for k in (1, 25, len(pairs) + 1):
+            assert pair_ids(store.strongest(stat, k)) == pair_ids(best[:k]), "strongest() differs"
+        for low, high, limit in ((None, 50, 25), (40, 80, None), (90, None, 7), (80, 40, 5)):
+            matches = sorted((pair for pair in pairs if (low is None or low <= getattr(pair[1], stat))
+                              and (high is None or getattr(pair[1], stat) <= high)), key=by_stat)
+            count, found = store.stat_range(stat, low, high, limit)
+            assert count == len(matches), "stat_range() count differs"
+            assert pair_ids(found) == pair_ids(matches[:limit]), "stat_range() pairs differ"
+
+
+def check_ranking(ops, seed):
+    """
+    Random inserts, removes and resizes on a ranking, after every step
+    compared with a sorted list of the same entries (order, locate/before
+    positions, ranking_top and removing entries that are not there).
+    """
+    rng = random.Random(seed)
+    nodes = {}
+    for i in range(rng.randrange(40)):
+        node = nodes[f"start{i}"] = ex7.create_owner_node(f"start{i}")
+        node["pokedex"] = dict.fromkeys(range(rng.randrange(6)))
+    ranking = ex7.new_ranking(sorted((len(node["pokedex"]), name, node) for name, node in nodes.items()))
+    for step in range(ops):
+        roll = rng.random()
+        name = f"owner{rng.randrange(60)}"
+        node = nodes.get(name)
+        if node is None and roll < 0.6:
+            node = nodes[name] = ex7.create_owner_node(name)
+            node["pokedex"] = dict.fromkeys(range(rng.randrange(6)))
+            ex7.ranking_insert(ranking, node)
+        elif node is not None and roll < 0.3:
+            ex7.ranking_remove(ranking, node, len(node["pokedex"]))
+            del nodes[name]
+        elif node is not None:
+            ex7.ranking_remove(ranking, node, len(node["pokedex"]))
+            node["pokedex"] = dict.fromkeys(range(rng.randrange(6)))
+            ex7.ranking_insert(ranking, node)
+        else:
+            stranger = ex7.create_owner_node(name)
+            assert not ranking.remove((0, name), lambda entry: entry[2] is stranger), "removed a missing entry"
+
+        expected = sorted((len(node["pokedex"]), name, id(node)) for name, node in nodes.items())
+        assert [(size, name, id(node)) for size, name, node in ranking] == expected, f"step {step}: order differs"
+        check_blocks(ranking)
+        keys = [entry[:2] for entry in expected]
+        for key in ((rng.randrange(7),), (rng.randrange(7), f"owner{rng.randrange(60)}")):
+            i, j = ranking.locate(key)
+            at = bisect_left(keys, key)
+            assert [entry[:2] for entry in ranking.iter_from(i, j)] == keys[at:], "locate() differs"
+            before = ranking.before(i, j)
+            assert (before[:2] if before else None) == (keys[at - 1] if at else None), "before() differs"
+        n = rng.randrange(len(nodes) + 2)
+        by_size = sorted(nodes.values(), key=lambda node: (-len(node["pokedex"]), node["owner_lower"]))
+        assert list(map(id, ex7.ranking_top(ranking, n))) == list(map(id, by_size[:n])), "ranking_top differs"
+
+
+def randomized_checks(seed):
+    """The ranking and a one-thread store workload, with tiny blocks."""
+    saved = SortedBlockList.LOAD
+    SortedBlockList.LOAD = TINY_LOAD
+    try:
+        check_ranking(3_000, seed)
+        species = ex7.get_catalog().data
+        store = ex7.ownerStore = ex7.OwnerStore()
+        names = [f"Trainer{i}" for i in range(200)]
+        for name in names[:100]:
+            store.insert_owner(ex7.create_owner_node(name, species[0]))
+        worker(store, species, names, 20_000, seed, [])
+        owners = check_store(store)
+    finally:
+        SortedBlockList.LOAD = saved
+    print(f"randomized checks (blocks of {TINY_LOAD}..{2 * TINY_LOAD}): ranking and {owners} owners consistent")
+
+
+def worker(store, species, names, ops, seed, counts):
+    rng = random.Random(seed)
+    done = 0
+    for _ in range(ops):
+        name = rng.choice(names)
+        roll = rng.random()
+        if roll < 0.5:
+            store.find(name)
+        elif roll < 0.85:
+            node = store.find(name)
+            if node is not None:
+                poke = rng.choice(species)
+                if roll < 0.7:
+                    store.add_species(node, poke)
+                else:
+                    store.remove_species(node, poke)
+        elif roll < 0.9:
+            node = store.find(name)
+            if node is not None:
+                if roll < 0.88:
+                    ex7.evolve_all_for_owner(node, final_form=roll < 0.87)
+                else:
+                    poke = rng.choice(species)
+                    target = ex7.get_catalog().evolutions.next_form(poke)
+                    if target is not None and store.add_species(node, poke):
+                        ex7.evolve_species_for_owner(node, poke, target)
+        elif roll < 0.95:
+            store.insert_owner(ex7.create_owner_node(name, rng.choice(species)))
+        else:
+            node = store.find(name)
+            if node is not None:
+                store.remove_owner(node)
+        done += 1
+    counts.append(done)
+
+
+def run(threads, owners, ops, species):
+    # A fresh store, installed as the default one the evolve helpers use
+    store = ex7.ownerStore = ex7.OwnerStore()
+    names = [f"Trainer{i}" for i in range(owners)]
+    for name in names[: owners // 2]:
+        store.insert_owner(ex7.create_owner_node(name, species[0]))
+
+    counts = []
+    pool = [threading.Thread(target=worker, args=(store, species, names, ops // threads, seed, counts))
+            for seed in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    remaining = check_store(store)
+    total = sum(counts)
+    print(f"{threads:>2} threads  {total:>9,} ops  {elapsed:7.3f} s  "
+          f"{total / elapsed:>10,.0f} ops/s  {remaining:>6,} owners  consistent")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--owners", type=int, default=5_000)
+    parser.add_argument("--ops", type=int, default=400_000)
+    parser.add_argument("--threads", default="1,2,4,8")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    randomized_checks(args.seed)
+    species = ex7.get_catalog().data
+    # Switch threads often so the locks actually get contended
+    sys.setswitchinterval(1e-5)
+    for threads in (int(n) for n in args.threads.split(",")):
+        run(threads, args.owners, args.ops, species)
+
+
+if __name__ == "__main__":
+    main()
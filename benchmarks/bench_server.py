@@ -0,0 +1,128 @@
+# bench_server.py
+#
+# Load generator for `ex7.py --serve`: starts the server in a subprocess,
+# opens many concurrent connections that each keep several requests in
+# flight (pipelined), and reports requests/sec and p50/p99 latency.
+#
+# Run from the repository root:
+#     python benchmarks/bench_server.py [--clients N] [--depth N] [--requests N] [--shards N]
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SPECIES = ["Treecko", "Torchic", "Mudkip", "Poochyena", "Zigzagoon", "Wurmple",
+           "Lotad", "Seedot", "Taillow", "Wingull", "Ralts", "Surskit"]
+
+
+def start_server(shards=None):
+    command = [sys.executable, os.path.join(ROOT, "ex7.py"), "--serve", "127.0.0.1:0"]
+    if shards:
+        command += ["--shards", str(shards)]
+    proc = subprocess.Popen(command, stderr=subprocess.PIPE, text=True)
+    line = proc.stderr.readline()
+    if not line.startswith("Listening on "):
+        proc.kill()
+        raise RuntimeError(f"server did not start: {line!r}")
+    host, _, port = line.split()[-1].rpartition(":")
+    return proc, host, int(port)
+
+
+def make_requests(client, count, rng):
+    owner = f"Client{client}"
+    yield {"op": "create", "owner": owner, "starter": "Mudkip"}
+    for _ in range(count - 1):
+        roll = rng.random()
+        if roll < 0.35:
+            yield {"op": "find", "owner": owner}
+        elif roll < 0.6:
+            yield {"op": "add", "owner": owner, "pokemon": rng.choice(SPECIES)}
+        elif roll < 0.8:
+            yield {"op": "release", "owner": owner, "pokemon": rng.choice(SPECIES)}
+        elif roll < 0.9:
+            yield {"op": "query", "owner": owner, "min_attack": rng.randint(0, 80)}
+        else:
+            yield {"op": "ranking", "top": 5}
+
+
+async def client(host, port, client_id, count, depth, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    rng = random.Random(client_id)
+    sent = {}
+    window = asyncio.Semaphore(depth)
+
+    async def send_all():
+        for i, request in enumerate(make_requests(client_id, count, rng)):
+            await window.acquire()
+            request["id"] = i
+            sent[i] = time.perf_counter()
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+
+    sender = asyncio.create_task(send_all())
+    for _ in range(count):
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - sent.pop(response["id"]))
+        window.release()
+    await sender
+    writer.close()
+    await writer.wait_closed()
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+async def run(host, port, clients, depth, requests):
+    latencies = []
+    per_client = requests // clients
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, c, per_client, depth, latencies) for c in range(clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{clients:>4} clients x depth {depth:<3} {len(latencies):>8,} requests  "
+          f"{len(latencies) / elapsed:>9,.0f} req/s  "
+          f"p50 {percentile(latencies, 0.50) * 1e3:7.2f} ms  "
+          f"p99 {percentile(latencies, 0.99) * 1e3:7.2f} ms")
+
+
+async def reset(host, port, clients):
+    reader, writer = await asyncio.open_connection(host, port)
+    for c in range(clients):
+        writer.write(json.dumps({"op": "delete", "owner": f"Client{c}"}).encode() + b"\n")
+    for _ in range(clients):
+        await reader.readline()
+    writer.close()
+    await writer.wait_closed()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", default="1,10,100")
+    parser.add_argument("--depth", default="1,16")
+    parser.add_argument("--requests", type=int, default=50_000)
+    parser.add_argument("--shards", type=int, help="serve from a sharded store with N worker processes")
+    args = parser.parse_args()
+
+    proc, host, port = start_server(args.shards)
+    try:
+        for clients in (int(n) for n in args.clients.split(",")):
+            for depth in (int(n) for n in args.depth.split(",")):
+                # Fresh owner names per run so "create" succeeds every time
+                asyncio.run(run(host, port, clients, depth, args.requests))
+                asyncio.run(reset(host, port, clients))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# bench_shards.py
+#
+# Throughput of pokedex_shards.ShardedOwnerStore against the single-process
+# store on the same seeded command stream, plus a check that every shard
+# count produces exactly the same responses.
+#
+# Shards only help when they can run on separate cores: expect close to no
+# gain (or a loss, from the pipe round trips) on a single-core machine.
+#
+# Run from the repository root:
+#     python benchmarks/bench_shards.py [--owners N] [--ops N] [--shards 1,2,4]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ex7  # noqa: E402
+from pokedex_shards import ShardedOwnerStore  # noqa: E402
+
+CHUNK = 4096
+
+
+def make_commands(owners, ops, seed):
+    rng = random.Random(seed)
+    species = [poke.name for poke in ex7.get_catalog().data]
+    commands = [{"op": "create", "owner": f"Trainer{i}", "starter": rng.choice(ex7.STARTER_NAMES)}
+                for i in range(owners)]
+    for _ in range(ops):
+        owner = f"Trainer{rng.randrange(owners)}"
+        roll = rng.random()
+        if roll < 0.45:
+            commands.append({"op": "add", "owner": owner, "pokemon": rng.choice(species)})
+        elif roll < 0.6:
+            commands.append({"op": "release", "owner": owner, "pokemon": rng.choice(species)})
+        elif roll < 0.75:
+            commands.append({"op": "query", "owner": owner, "min_attack": rng.randint(20, 90)})
+        elif roll < 0.85:
+            commands.append({"op": "evolve_all", "owner": owner})
+        elif roll < 0.9995:
+            commands.append({"op": "find", "owner": owner})
+        else:
+            # Occasional fleet-wide jobs, answered by every shard
+            commands.append(rng.choice([{"op": "ranking", "top": 10}, {"op": "stats"},
+                                        {"op": "query", "type": "Water"}, {"op": "evolve_all"}]))
+    return commands
+
+
+def run_local(commands):
+    return [ex7.command_response(command) for command in commands]
+
+
+def run_sharded(store, commands):
+    responses = []
+    for start in range(0, len(commands), CHUNK):
+        responses.extend(store.respond_many(commands[start:start + CHUNK]))
+    return responses
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--owners", type=int, default=20_000)
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--shards", default="1,2,4")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    commands = make_commands(args.owners, args.ops, args.seed)
+    print(f"--- {len(commands):,} commands, {args.owners:,} owners, {os.cpu_count()} CPU(s) ---")
+
+    expected, seconds = timed(run_local, commands)
+    base = len(commands) / seconds
+    print(f"single process   {seconds:7.2f} s  {base:>10,.0f} ops/s")
+
+    for shards in (int(n) for n in args.shards.split(",")):
+        with ShardedOwnerStore(shards) as store:
+            responses, seconds = timed(run_sharded, store, commands)
+        rate = len(commands) / seconds
+        status = "identical" if responses == expected else "MISMATCH"
+        print(f"{shards:>2} shard(s)       {seconds:7.2f} s  {rate:>10,.0f} ops/s  x{rate / base:.2f}  {status}")
+
+
+if __name__ == "__main__":
+    main()
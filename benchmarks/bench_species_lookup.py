@@ -0,0 +1,73 @@
+# bench_species_lookup.py
+#
+# Compares the old linear-scan species lookups against the precomputed
+# indexes built by species_catalog.build_species_indexes.
+#
+# Run from the repository root:
+#     python benchmarks/bench_species_lookup.py
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import species_catalog  # noqa: E402
+
+TYPES = ["Grass", "Fire", "Water", "Bug", "Normal", "Dark", "Psychic", "Steel"]
+LOOKUPS = 1000
+
+
+def make_catalog(size):
+    return [
+        species_catalog.Species(i, f"Species{i}", TYPES[i % len(TYPES)],
+                                40 + i % 100, 30 + i % 120, i % 3 != 0)
+        for i in range(1, size + 1)
+    ]
+
+
+def scan_by_id(data_list, poke_id):
+    for poke in data_list:
+        if poke.id == poke_id:
+            return poke
+    return None
+
+
+def scan_by_name(data_list, name):
+    name = name.lower()
+    for poke in data_list:
+        if poke.name.lower() == name:
+            return poke
+    return None
+
+
+def run(size):
+    data_list = make_catalog(size)
+    by_id, by_name, _ = species_catalog.build_species_indexes(data_list)
+
+    rng = random.Random(size)
+    ids = [rng.randint(1, size) for _ in range(LOOKUPS)]
+    names = [f"species{i}" for i in ids]
+
+    # Scans are slow at these sizes, so time a smaller sample of them
+    scan_sample = 20
+    scan_id = timeit.timeit(lambda: [scan_by_id(data_list, i) for i in ids[:scan_sample]], number=1) / scan_sample
+    scan_name = timeit.timeit(lambda: [scan_by_name(data_list, n) for n in names[:scan_sample]], number=1) / scan_sample
+    index_id = timeit.timeit(lambda: [by_id.get(i) for i in ids], number=1) / LOOKUPS
+    index_name = timeit.timeit(lambda: [by_name.get(n.casefold()) for n in names], number=1) / LOOKUPS
+
+    print(f"--- {size:,} species ---")
+    print(f"by ID   : scan {scan_id * 1e6:10.2f} us   index {index_id * 1e6:8.3f} us   "
+          f"x{scan_id / index_id:,.0f}")
+    print(f"by name : scan {scan_name * 1e6:10.2f} us   index {index_name * 1e6:8.3f} us   "
+          f"x{scan_name / index_name:,.0f}")
+
+
+def main():
+    for size in (10_000, 100_000):
+        run(size)
+
+
+if __name__ == "__main__":
+    main()
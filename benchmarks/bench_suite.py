@@ -0,0 +1,289 @@
+# bench_suite.py
+#
+# Reproducible benchmark suite for the owner/Pokedex workload. For every
+# (size, insertion order) workload it generates seeded synthetic owners with
+# skewed Pokedex sizes, drives the ex7 functions directly (no input()) in a
+# fresh subprocess, and reports ops/sec, latency percentiles and the peak RSS
+# of that subprocess.
+#
+# Results can be saved as JSON and compared with an earlier run; cases whose
+# throughput drops or whose p99 latency grows by more than --threshold are
+# flagged and make the script exit with status 1.
+#
+# Run from the repository root:
+#     python benchmarks/bench_suite.py [--sizes 1000,10000,100000,1000000]
+#         [--orders sorted,random] [--seed N] [--output results.json]
+#         [--compare baseline.json] [--threshold 0.15]
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import resource
+import string
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SAMPLE_OPS = 20_000  # Operations timed per point-operation case
+SWEEPS = 3  # Repeats of the whole-fleet cases (listings, filters)
+MAX_POKEDEX = 60
+
+
+########################
+# Workload generation
+########################
+
+def owner_names(size, rng):
+    # Unique ignoring case, like the owner tree: a clash would be rejected on
+    # insert and leave later cases working on an unregistered node
+    names = {}
+    while len(names) < size:
+        name = "".join(rng.choices(string.ascii_letters, k=rng.randint(4, 12)))
+        names.setdefault(name.lower(), name)
+    return sorted(names.values(), key=str.lower)
+
+
+def pokedex_size(rng):
+    # Pareto-distributed: most owners hold a handful, a few hold dozens
+    return min(MAX_POKEDEX, int(rng.paretovariate(1.3)))
+
+
+def make_owners(ex7, size, order, seed):
+    rng = random.Random(seed)
+    catalog = ex7.get_catalog()
+    starters = [catalog.by_name[name.casefold()] for name in ex7.STARTER_NAMES]
+    names = owner_names(size, rng)
+    if order == "random":
+        rng.shuffle(names)
+
+    nodes = []
+    for name in names:
+        node = ex7.create_owner_node(name, rng.choice(starters))
+        for poke in rng.sample(catalog.data, pokedex_size(rng)):
+            node["pokedex"].setdefault(poke.id, poke)
+        nodes.append(node)
+    return nodes
+
+
+########################
+# Cases
+########################
+
+def timed_ops(func, args_list):
+    """Calls func(*args) for each entry; returns per-call latencies in ns."""
+    clock = time.perf_counter_ns
+    latencies = []
+    for args in args_list:
+        start = clock()
+        func(*args)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def run_cases(ex7, nodes, seed):
+    rng = random.Random(seed + 1)
+    catalog = ex7.get_catalog()
+    data = catalog.data
+    sample = min(SAMPLE_OPS, len(nodes))
+    sink = ex7.LineWriter(io.StringIO(), chunk_lines=1 << 16)
+
+    def drain(writer):
+        writer.flush()
+        writer.stream.seek(0)
+        writer.stream.truncate()
+
+    def listing(func):
+        func()
+        drain(sink)
+
+    cases = {}
+    cases["insert"] = timed_ops(ex7.register_owner, [(node,) for node in nodes])
+    cases["find_hit"] = timed_ops(ex7.ownerStore.find,
+                                  [(node["owner_lower"],) for node in rng.sample(nodes, sample)])
+    cases["find_miss"] = timed_ops(ex7.ownerStore.find, [(f"~missing{i}",) for i in range(sample)])
+    cases["add_species"] = timed_ops(ex7.add_species_to_owner,
+                                     [(rng.choice(nodes), rng.choice(data)) for _ in range(sample)])
+    cases["release_species"] = timed_ops(ex7.remove_species_from_owner,
+                                         [(rng.choice(nodes), rng.choice(data)) for _ in range(sample)])
+    cases["evolve_all_owner"] = timed_ops(ex7.evolve_all_for_owner,
+                                          [(rng.choice(nodes),) for _ in range(sample)])
+    cases["top10"] = timed_ops(ex7.top_owners, [(10,)] * sample)
+    cases["holders_all2"] = timed_ops(ex7.ownerStore.owners_with,
+                                      [([rng.choice(data).id, rng.choice(data).id], (), 100)
+                                       for _ in range(min(sample, 2_000))])
+    cases["strongest100"] = timed_ops(ex7.ownerStore.strongest,
+                                      [(rng.choice(("hp", "attack")), 100) for _ in range(2_000)])
+    cases["attack_range100"] = timed_ops(ex7.ownerStore.stat_range,
+                                         [("attack", low, low + 20, 100)
+                                          for low in (rng.randint(20, 140) for _ in range(2_000))])
+
+    cases["ranking_listing"] = timed_ops(
+        listing, [(lambda: ex7.sort_owners_by_num_pokemon(writer=sink),)] * SWEEPS)
+    cases["bfs_listing"] = timed_ops(
+        listing, [(lambda: ex7.print_owners(ex7.ownerStore.owners("bfs"), writer=sink),)] * SWEEPS)
+    cases["filter_all"] = timed_ops(
+        lambda criteria: sum(1 for _ in ex7.filter_all_owners(**criteria)),
+        [({"poke_type": rng.choice(data).type, "min_attack": rng.randint(20, 100)},) for _ in range(SWEEPS)])
+
+    doomed = rng.sample(nodes, sample)
+    cases["delete"] = timed_ops(ex7.unregister_owner, [(node,) for node in doomed])
+    return cases
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+def summarize(latencies):
+    latencies = sorted(latencies)
+    total = sum(latencies)
+    return {
+        "ops": len(latencies),
+        "seconds": total / 1e9,
+        "ops_per_sec": len(latencies) / (total / 1e9) if total else 0.0,
+        "p50_us": percentile(latencies, 0.50) / 1e3,
+        "p90_us": percentile(latencies, 0.90) / 1e3,
+        "p99_us": percentile(latencies, 0.99) / 1e3,
+        "max_us": latencies[-1] / 1e3,
+    }
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+
+
+def worker(size, order, seed):
+    """Runs one workload in this (fresh) process and prints its results as JSON."""
+    import ex7
+
+    ex7.get_catalog()
+    baseline_mb = peak_rss_mb()
+    start = time.perf_counter()
+    nodes = make_owners(ex7, size, order, seed)
+    generate_seconds = time.perf_counter() - start
+    owned_pokemon = sum(len(node["pokedex"]) for node in nodes)
+
+    cases = run_cases(ex7, nodes, seed)
+    json.dump({
+        "size": size,
+        "order": order,
+        "generate_seconds": generate_seconds,
+        "owned_pokemon": owned_pokemon,
+        "baseline_rss_mb": baseline_mb,
+        "peak_rss_mb": peak_rss_mb(),
+        "cases": {name: summarize(latencies) for name, latencies in cases.items()},
+    }, sys.stdout)
+
+
+########################
+# Driver
+########################
+
+def run_workload(size, order, seed):
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", str(size), order,
+                           "--seed", str(seed)], capture_output=True, text=True, cwd=ROOT)
+    if proc.returncode != 0:
+        raise RuntimeError(f"workload {size}/{order} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout)
+
+
+def print_workload(result):
+    print(f"--- {result['size']:,} owners, {result['order']} order, "
+          f"{result['owned_pokemon']:,} Pokemon, peak RSS {result['peak_rss_mb']:.0f} MB ---")
+    for name, case in result["cases"].items():
+        print(f"  {name:<18} {case['ops']:>9,} ops  {case['ops_per_sec']:>12,.0f} ops/s  "
+              f"p50 {case['p50_us']:>10.1f} us  p99 {case['p99_us']:>10.1f} us")
+
+
+def compare(results, baseline, threshold):
+    """Returns a list of human-readable regressions against 'baseline'."""
+    previous = {(w["size"], w["order"]): w for w in baseline["workloads"]}
+    regressions = []
+    for workload in results["workloads"]:
+        old = previous.get((workload["size"], workload["order"]))
+        if old is None:
+            continue
+        label = f"{workload['size']}/{workload['order']}"
+        for name, case in workload["cases"].items():
+            old_case = old["cases"].get(name)
+            if old_case is None:
+                continue
+            if case["ops_per_sec"] < old_case["ops_per_sec"] * (1 - threshold):
+                regressions.append(f"{label} {name}: {old_case['ops_per_sec']:,.0f} -> "
+                                   f"{case['ops_per_sec']:,.0f} ops/s")
+            if case["p99_us"] > old_case["p99_us"] * (1 + threshold):
+                regressions.append(f"{label} {name}: p99 {old_case['p99_us']:.1f} -> {case['p99_us']:.1f} us")
+        if workload["peak_rss_mb"] > old["peak_rss_mb"] * (1 + threshold):
+            regressions.append(f"{label}: peak RSS {old['peak_rss_mb']:.0f} -> {workload['peak_rss_mb']:.0f} MB")
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=ROOT).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000")
+    parser.add_argument("--orders", default="sorted,random")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", metavar="FILE", help="save the results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="flag regressions against an earlier --output")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative change that counts as a regression (default: 0.15)")
+    parser.add_argument("--worker", nargs=2, metavar=("SIZE", "ORDER"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(int(args.worker[0]), args.worker[1], args.seed)
+        return 0
+
+    from species_catalog import optional_numpy
+
+    results = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": optional_numpy() is not None,
+            "seed": args.seed,
+        },
+        "workloads": [],
+    }
+    for size in (int(n) for n in args.sizes.split(",")):
+        for order in args.orders.split(","):
+            result = run_workload(size, order, args.seed)
+            print_workload(result)
+            results["workloads"].append(result)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,46 +1,83 @@
-import csv
-
-# Global BST root
-ownerRoot = None
+import gc
+import os
+import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from heapq import merge, nsmallest
+from itertools import islice
+
+from pokedex_db import (open_db, db_insert_owner, db_insert_owners, db_delete_owner, db_save_pokedex,
+                        db_load_owners)
+from pokedex_render import (NO_MATCH_MESSAGE, LineWriter, csv_field, write_owners, write_pokemon_list,
+                            write_ranking)
+from pokedex_index import SpeciesOwnerIndex, StatIndex, owner_key
+from pokedex_metrics import Metrics, Profiler
+from pokedex_stats import OwnerAggregates, compute_aggregates, owner_averages, summarize
+from sorted_blocks import SortedBlockList
+from species_catalog import SpeciesCatalog, load_species_catalog, optional_numpy
+
+# The species catalog is read lazily by get_catalog(). The CSV is found next
+# to this file unless EX7_CATALOG or set_catalog_path() says otherwise.
+catalogPath = os.environ.get("EX7_CATALOG",
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), "hoenn_pokedex.csv"))
+hoennCatalog = None
+
+# Output format of the listings: "text" (the menus' format), "json" or "csv"
+renderFormat = "text"
 
 ########################
-# 0) Read from CSV -> HOENN_DATA
+# 0) Read from CSV -> species catalog
 ########################
 
 
 def read_hoenn_csv(filename):
     """
-    Reads 'hoenn_pokedex.csv' and returns a list of dicts:
-      [ { "ID": int, "Name": str, "Type": str, "HP": int,
-          "Attack": int, "Can Evolve": "TRUE"/"FALSE" },
-        ... ]
+    Reads 'hoenn_pokedex.csv' and returns a list of Species records:
+      [ Species(ID, Name, Type, HP, Attack, Can Evolve as bool), ... ]
+    Malformed rows are reported and skipped rather than ending the read.
     """
-    data_list = []
-    with open(filename, mode='r', encoding='utf-8') as f:
-        reader = csv.reader(f, delimiter=',')  # Use comma as the delimiter
-        first_row = True
-        for row in reader:
-            # It's the header row (like ID,Name,Type,HP,Attack,Can Evolve), skip it
-            if first_row:
-                first_row = False
-                continue
-
-            # row => [ID, Name, Type, HP, Attack, Can Evolve]
-            if not row or not row[0].strip():
-                break  # Empty or invalid row => stop
-            d = {
-                "ID": int(row[0]),
-                "Name": str(row[1]),
-                "Type": str(row[2]),
-                "HP": int(row[3]),
-                "Attack": int(row[4]),
-                "Can Evolve": str(row[5]).upper()
-            }
-            data_list.append(d)
+    errors = []
+    data_list = load_species_catalog(filename, errors)
+    for line_number, reason in errors:
+        print(f"Skipping line {line_number} of {filename}: {reason}", file=sys.stderr)
     return data_list
 
 
-HOENN_DATA = read_hoenn_csv("hoenn_pokedex.csv")
+def __getattr__(name):
+    # HOENN_DATA and its indexes used to be module globals built at import
+    # time; keep them reachable, but only load the catalog when asked.
+    # ownerRoot / ownerRanking / ownerDb now live on the default OwnerStore.
+    if name == "ownerRoot":
+        return ownerStore.root
+    if name == "ownerRanking":
+        return ownerStore.ranking
+    if name == "ownerDb":
+        return ownerStore.db
+    if name == "HOENN_DATA":
+        return get_catalog().data
+    if name == "HOENN_BY_ID":
+        return get_catalog().by_id
+    if name == "HOENN_BY_NAME":
+        return get_catalog().by_name
+    if name == "HOENN_BY_TYPE":
+        return get_catalog().by_type
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def set_catalog_path(path):
+    """Points the catalog at another CSV; it is (re)loaded on next access."""
+    global catalogPath, hoennCatalog
+    catalogPath = path
+    hoennCatalog = None
+
+
+def get_catalog():
+    """Returns the SpeciesCatalog, reading the CSV on first access."""
+    global hoennCatalog
+    if hoennCatalog is None:
+        hoennCatalog = SpeciesCatalog(read_hoenn_csv(catalogPath))
+    return hoennCatalog
 
 ########################
 # 1) Helper Functions
@@ -56,40 +93,44 @@ def read_int_safe(prompt):
         print("Invalid input.")
 
 def get_poke_dict_by_id(poke_id):
-    for poke in HOENN_DATA:
-        if poke["ID"] == poke_id:
-            return poke.copy()
+    poke = get_catalog().by_id.get(poke_id)
+    if poke is not None:
+        return poke  # Shared immutable record, no copy needed
     print(f"ID {poke_id} not found in Honen data.")
     return None
 
 def get_poke_dict_by_name(name):
-    name = name.strip().lower()
-    for poke in HOENN_DATA:
-        if poke["Name"].lower() == name:
-            return poke.copy()
+    name = name.strip().casefold()
+    poke = get_catalog().by_name.get(name)
+    if poke is not None:
+        return poke
     print(f"Pokemon '{name.capitalize()}' not found in Hoenn data.")
     return None  # Ensure None is returned if name is not found
 
-def display_pokemon_list(poke_list):
-    if not poke_list:
-        print("There are no Pokemons in this Pokedex that match the criteria.")
-        return
+def get_pokes_by_type(poke_type):
+    return list(get_catalog().by_type.get(poke_type.strip().casefold(), []))
 
-    for poke in poke_list:
-        print(f"ID: {poke['ID']}, Name: {poke['Name']}, Type: {poke['Type']}, "
-              f"HP: {poke['HP']}, Attack: {poke['Attack']}, Can Evolve: {poke['Can Evolve']}")
+def display_pokemon_list(poke_list, writer=None):
+    """
+    Writes the Pokemon in the current renderFormat to 'writer' (a
+    pokedex_render.LineWriter), or straight to stdout if none is given.
+    """
+    own_writer = writer is None
+    if own_writer:
+        writer = LineWriter()
+    write_pokemon_list(writer, poke_list, renderFormat)
+    if own_writer:
+        writer.flush()
 
 ########################
 # 2) BST (By Owner Name)
 ########################
 def create_pokedex():
-    global ownerRoot  # The BST root
-
     # Get owner name
     owner_name = input("Owner name: ").strip()
 
     # Check if owner already exists in BST
-    if find_owner_bst(ownerRoot, owner_name.lower()) is not None:
+    if ownerStore.find(owner_name) is not None:
         print(f"Owner '{owner_name}' already exists. No new Pokedex created.")
         return
 
@@ -116,7 +157,7 @@ def create_pokedex():
     new_owner_node = create_owner_node(owner_name, starter_pokemon)
 
     # Insert into the BST
-    ownerRoot = insert_owner_bst(ownerRoot, new_owner_node)
+    register_owner(new_owner_node)
 
     print(f"New Pokedex created for {owner_name} with starter {starter_pokemon['Name']}.")
 
@@ -124,119 +165,375 @@ def create_owner_node(owner_name, first_pokemon=None):
     return {
         "owner_lower": owner_name.lower(),  # Used for comparison
         "owner_original": owner_name,  # Preserving the original format for printing
-        "pokedex": [first_pokemon] if first_pokemon else [],
+        # Species ID -> Species; dicts keep insertion order for display
+        "pokedex": {first_pokemon.id: first_pokemon} if first_pokemon else {},
+        "starter": first_pokemon.id if first_pokemon else None,  # Species ID, kept for statistics
+        "slot": None,  # Position in the species -> owners index while registered
         "left": None,
-        "right": None
+        "right": None,
+        "height": 1  # AVL height of the subtree rooted here
     }
 
+# The owner BST is kept AVL-balanced so lookups stay O(log n) even when
+# owners are inserted in alphabetical order.
+
+def node_height(node):
+    return node["height"] if node is not None else 0
+
+def update_height(node):
+    node["height"] = 1 + max(node_height(node["left"]), node_height(node["right"]))
+
+def balance_factor(node):
+    return node_height(node["left"]) - node_height(node["right"])
+
+def rotate_right(node):
+    pivot = node["left"]
+    node["left"] = pivot["right"]
+    pivot["right"] = node
+    update_height(node)
+    update_height(pivot)
+    return pivot
+
+def rotate_left(node):
+    pivot = node["right"]
+    node["right"] = pivot["left"]
+    pivot["left"] = node
+    update_height(node)
+    update_height(pivot)
+    return pivot
+
+def rebalance(node):
+    update_height(node)
+    balance = balance_factor(node)
+
+    if balance > 1:
+        if balance_factor(node["left"]) < 0:
+            node["left"] = rotate_left(node["left"])
+        return rotate_right(node)
+    if balance < -1:
+        if balance_factor(node["right"]) > 0:
+            node["right"] = rotate_right(node["right"])
+        return rotate_left(node)
+    return node
+
+def rebalance_path(path):
+    """
+    Rebalances every node on a root-to-node path, bottom-up, re-linking each
+    (possibly rotated) subtree to its parent. Returns the new tree root.
+    """
+    subtree = None
+    for i in range(len(path) - 1, -1, -1):
+        node = path[i]
+        subtree = rebalance(node)
+        if i > 0:
+            parent = path[i - 1]
+            if parent["left"] is node:
+                parent["left"] = subtree
+            else:
+                parent["right"] = subtree
+    return subtree
+
 def insert_owner_bst(root, new_node):
     if root is None:
         return new_node  # Tree is empty → New node becomes root
 
-    if new_node["owner_lower"] < root["owner_lower"]:
-        root["left"] = insert_owner_bst(root["left"], new_node)
-    elif new_node["owner_lower"] > root["owner_lower"]:
-        root["right"] = insert_owner_bst(root["right"], new_node)
+    # Walk down iteratively, remembering the path for rebalancing
+    path = []
+    current = root
+    while current is not None:
+        path.append(current)
+        if new_node["owner_lower"] < current["owner_lower"]:
+            current = current["left"]
+        elif new_node["owner_lower"] > current["owner_lower"]:
+            current = current["right"]
+        else:
+            return root  # Owner already exists → tree unchanged
 
-    return root
+    parent = path[-1]
+    if new_node["owner_lower"] < parent["owner_lower"]:
+        parent["left"] = new_node
+    else:
+        parent["right"] = new_node
 
-def find_owner_bst(root, owner_name):
-    if root is None:
-        return None
+    return rebalance_path(path)
 
+def find_owner_bst(root, owner_name):
     owner_name = owner_name.lower()  # Convert input to lowercase for comparison
 
-    if owner_name < root["owner_lower"]:
-        return find_owner_bst(root["left"], owner_name)
-    elif owner_name > root["owner_lower"]:
-        return find_owner_bst(root["right"], owner_name)
-    else:
-        return root  # Found the owner
+    current = root
+    while current is not None:
+        if owner_name < current["owner_lower"]:
+            current = current["left"]
+        elif owner_name > current["owner_lower"]:
+            current = current["right"]
+        else:
+            return current  # Found the owner
 
+    return None
 
-def min_node(node):
-    while node["left"] is not None:
-        node = node["left"]
-    return node
+
+def owners_from(root, owner_name):
+    """
+    Yields owner nodes in name order, starting at the first owner whose
+    lowercase name is >= owner_name. Costs O(log n) to start, O(1)
+    amortised per owner after that.
+    """
+    owner_name = owner_name.lower()
+
+    stack = []
+    current = root
+    while current is not None:
+        if current["owner_lower"] >= owner_name:
+            stack.append(current)
+            current = current["left"]
+        else:
+            current = current["right"]
+
+    while stack:
+        node = stack.pop()
+        yield node
+        current = node["right"]
+        while current is not None:
+            stack.append(current)
+            current = current["left"]
+
+def owners_with_prefix(root, prefix, limit=None):
+    """Returns up to 'limit' owners whose name starts with 'prefix', in name order."""
+    prefix = prefix.lower()
+    result = []
+    for node in owners_from(root, prefix):
+        if not node["owner_lower"].startswith(prefix) or len(result) == limit:
+            break
+        result.append(node)
+    return result
+
+def complete_owner_names(prefix, limit=10):
+    with ownerStore.lock.read():
+        return [node["owner_original"] for node in owners_with_prefix(ownerStore.root, prefix, limit)]
+
+def complete_species_names(prefix, limit=10):
+    return [poke.name for poke in get_catalog().species_with_prefix(prefix, limit)]
 
 
 def delete_owner_bst(root, owner_name):
-    if root is None:
-        return None
-
     owner_name = owner_name.lower()  # Convert input to lowercase for searching
 
-    if owner_name < root["owner_lower"]:
-        root["left"] = delete_owner_bst(root["left"], owner_name)
-    elif owner_name > root["owner_lower"]:
-        root["right"] = delete_owner_bst(root["right"], owner_name)
+    path = []
+    current = root
+    while current is not None and current["owner_lower"] != owner_name:
+        path.append(current)
+        if owner_name < current["owner_lower"]:
+            current = current["left"]
+        else:
+            current = current["right"]
+
+    if current is None:
+        return root  # Owner not found → tree unchanged
+
+    if current["left"] is None or current["right"] is None:
+        replacement = current["left"] if current["left"] is not None else current["right"]
+        fix_path = path
     else:
-        # Node found, apply BST deletion rules
-        if root["left"] is None:
-            return root["right"]
-        elif root["right"] is None:
-            return root["left"]
+        # Two children: splice the in-order successor into this position.
+        # The successor node itself is moved (not its data copied), so
+        # references to owner nodes held elsewhere stay valid.
+        successor_path = []
+        successor = current["right"]
+        while successor["left"] is not None:
+            successor_path.append(successor)
+            successor = successor["left"]
+
+        if successor_path:
+            successor_path[-1]["left"] = successor["right"]
+            successor["right"] = current["right"]
+        successor["left"] = current["left"]
+        replacement = successor
+        fix_path = path + [successor] + successor_path
+
+    if path:
+        parent = path[-1]
+        if parent["left"] is current:
+            parent["left"] = replacement
         else:
-            successor = min_node(root["right"])
-            root["owner_lower"] = successor["owner_lower"]
-            root["owner_original"] = successor["owner_original"]
-            root["pokedex"] = successor["pokedex"]
-            root["right"] = delete_owner_bst(root["right"], successor["owner_lower"])
+            parent["right"] = replacement
 
-    return root
+    current["left"] = None
+    current["right"] = None
+    current["height"] = 1
+
+    if not fix_path:
+        return replacement
+    return rebalance_path(fix_path)
+
+def register_owner(owner_node):
+    """Adds a new owner to the default store. Returns False if the name is taken."""
+    return ownerStore.insert_owner(owner_node)
+
+def unregister_owner(owner_node):
+    """Removes an owner from the default store."""
+    return ownerStore.remove_owner(owner_node)
+
+def build_balanced_owner_tree(sorted_nodes):
+    """
+    Builds a perfectly balanced BST in O(n) from owner nodes already sorted
+    by "owner_lower". Returns the root.
+    """
+    def build(lo, hi):
+        if lo > hi:
+            return None
+        mid = (lo + hi) // 2
+        node = sorted_nodes[mid]
+        node["left"] = build(lo, mid - 1)
+        node["right"] = build(mid + 1, hi)
+        update_height(node)
+        return node
+
+    return build(0, len(sorted_nodes) - 1)
+
+def sorted_unique_owners(owner_nodes):
+    """
+    Owner nodes sorted by "owner_lower", keeping the first of any repeated
+    name. Input that is already sorted costs O(n): the sort finds one run.
+    """
+    nodes = sorted(owner_nodes, key=lambda node: node["owner_lower"])
+    unique = []
+    for node in nodes:
+        if not unique or unique[-1]["owner_lower"] != node["owner_lower"]:
+            unique.append(node)
+    return unique
+
+def merge_owner_runs(existing, new_nodes):
+    """
+    Merges two name-sorted runs of owner nodes in O(n + m). Returns
+    (merged, added): new nodes whose name is already taken are left out.
+    """
+    merged = []
+    added = []
+    new_iter = iter(new_nodes)
+    pending = next(new_iter, None)
+    for node in existing:
+        while pending is not None and pending["owner_lower"] < node["owner_lower"]:
+            merged.append(pending)
+            added.append(pending)
+            pending = next(new_iter, None)
+        if pending is not None and pending["owner_lower"] == node["owner_lower"]:
+            pending = next(new_iter, None)
+        merged.append(node)
+    while pending is not None:
+        merged.append(pending)
+        added.append(pending)
+        pending = next(new_iter, None)
+    return merged, added
 
 ########################
 # 3) BST Traversals
 ########################
 
-def bfs_traversal(root):
+# The traversals are iterative generators yielding owner nodes lazily, so
+# callers can page through or stop early, and deep trees cannot overflow
+# the stack. Extra memory is the queue/stack only.
+
+def bfs_owners(root):
     if root is None:
         return
 
-    queue = [root]
-
+    queue = deque([root])
     while queue:
-        current = queue.pop(0)
-        print(f"Owner: {current['owner_original']}")  # Preserve original capitalization
-        display_pokemon_list(current["pokedex"])
+        current = queue.popleft()
+        yield current
 
         if current["left"]:
             queue.append(current["left"])
         if current["right"]:
             queue.append(current["right"])
 
-def pre_order(root):
-    if root is None:
-        return
+def pre_order_owners(root):
+    stack = [root] if root is not None else []
+    while stack:
+        current = stack.pop()
+        yield current
 
-    print(f"\nOwner: {root['owner_original']}")
-    display_pokemon_list(root["pokedex"])
+        # Push right first so the left subtree is visited first
+        if current["right"]:
+            stack.append(current["right"])
+        if current["left"]:
+            stack.append(current["left"])
+
+def in_order_owners(root):
+    stack = []
+    current = root
+    while stack or current is not None:
+        while current is not None:
+            stack.append(current)
+            current = current["left"]
+        current = stack.pop()
+        yield current
+        current = current["right"]
+
+def post_order_owners(root):
+    stack = []
+    last_visited = None
+    current = root
+    while stack or current is not None:
+        while current is not None:
+            stack.append(current)
+            current = current["left"]
+
+        top = stack[-1]
+        if top["right"] is not None and top["right"] is not last_visited:
+            current = top["right"]
+        else:
+            stack.pop()
+            yield top
+            last_visited = top
 
-    pre_order(root["left"])
-    pre_order(root["right"])
+def print_owners(owner_nodes, header_prefix="", writer=None):
+    """
+    Prints each owner followed by their Pokedex through one buffered
+    LineWriter (stdout unless 'writer' is given), in the current renderFormat.
+    """
+    own_writer = writer is None
+    if own_writer:
+        writer = LineWriter()
+    write_owners(writer, owner_nodes, renderFormat, header_prefix)
+    if own_writer:
+        writer.flush()
 
-def in_order(root):
-    if root is None:
-        return
+def bfs_traversal(root):
+    print_owners(bfs_owners(root))
 
-    in_order(root["left"])
-    print(f"\nOwner: {root['owner_original']}")
-    display_pokemon_list(root["pokedex"])
-    in_order(root["right"])
+def pre_order(root):
+    print_owners(pre_order_owners(root), "\n")
 
-def post_order(root):
-    if root is None:
-        return
+def in_order(root):
+    print_owners(in_order_owners(root), "\n")
 
-    post_order(root["left"])
-    post_order(root["right"])
-    print(f"\nOwner: {root['owner_original']}")
-    display_pokemon_list(root["pokedex"])
+def post_order(root):
+    print_owners(post_order_owners(root), "\n")
 
 ########################
 # 4) Pokedex Operations
 ########################
 
+def owner_has_pokemon(owner_node, poke_id):
+    return poke_id in owner_node["pokedex"]
+
+def find_owned_pokemon_by_name(owner_node, poke_name):
+    """
+    Returns the owner's Species with this name, or None. Catalog names are
+    unique, so the name index is the catalog's and this is two hash probes.
+    """
+    pokemon = get_catalog().by_name.get(poke_name.strip().casefold())
+    if pokemon is None or pokemon.id not in owner_node["pokedex"]:
+        return None
+    return pokemon
+
+def add_species_to_owner(owner_node, pokemon):
+    return ownerStore.add_species(owner_node, pokemon)
+
+def remove_species_from_owner(owner_node, pokemon):
+    return ownerStore.remove_species(owner_node, pokemon)
+
 def add_pokemon_to_owner(owner_node):
     poke_id = read_int_safe("Enter Pokemon ID to add: ")
     pokemon = get_poke_dict_by_id(poke_id)
@@ -244,61 +541,83 @@ def add_pokemon_to_owner(owner_node):
     if pokemon is None:
         return
 
-    # Check for duplicates
-    if any(p["ID"] == poke_id for p in owner_node["pokedex"]):
+    # Check for duplicates and add to the end of the Pokedex
+    if not add_species_to_owner(owner_node, pokemon):
         print("Pokemon already in the list. No changes made.\n")
         return
 
-    # Add to the end of the list
-    owner_node["pokedex"].append(pokemon)
-    print(f"Pokemon {pokemon['Name']} (ID {pokemon['ID']}) added to {owner_node['owner_original']}'s Pokedex.\n")
+    print(f"Pokemon {pokemon.name} (ID {pokemon.id}) added to {owner_node['owner_original']}'s Pokedex.\n")
 def release_pokemon_by_name(owner_node):
     poke_name = input("Enter Pokemon Name to release: ").strip().lower()
 
-    for i, pokemon in enumerate(owner_node["pokedex"]):
-        if pokemon["Name"].lower() == poke_name:
-            print(f"Releasing {pokemon['Name']} from {owner_node['owner_original']}.")
-            del owner_node["pokedex"][i]
-            return
+    pokemon = find_owned_pokemon_by_name(owner_node, poke_name)
+    if pokemon is not None:
+        print(f"Releasing {pokemon.name} from {owner_node['owner_original']}.")
+        remove_species_from_owner(owner_node, pokemon)
+        return
 
     print(f"No Pokemon named '{poke_name}' in {owner_node['owner_original']}'s Pokedex.")
 def evolve_pokemon_by_name(owner_node):
     poke_name = input("Enter Pokemon Name to evolve: ").strip().lower()
 
-    for i, poke in enumerate(owner_node["pokedex"]):
-        if poke["Name"].lower() == poke_name:
-            if poke["Can Evolve"] == "FALSE":
-                print(f"{poke['Name']} cannot evolve further.")
-                return
+    poke = find_owned_pokemon_by_name(owner_node, poke_name)
+    if poke is None:
+        print(f"No Pokemon named '{poke_name}' in {owner_node['owner_original']}'s Pokedex.")
+        return
 
-            evolved_pokemon = get_poke_dict_by_id(poke["ID"] + 1)
+    if not poke.can_evolve:
+        print(f"{poke.name} cannot evolve further.")
+        return
 
-            if evolved_pokemon is None:
-                print(f"{poke['Name']} has no further evolution.")
-                return
+    evolved_pokemon = get_catalog().evolutions.next_form(poke)
 
-            # Remove old pokemon and add evolved pokemon
-            del owner_node["pokedex"][i]
+    if evolved_pokemon is None:
+        print(f"{poke.name} has no further evolution.")
+        return
 
-            # If the evolved pokemon is already present, release it.
-            if any(p["ID"] == evolved_pokemon["ID"] for p in owner_node["pokedex"]):
-                print(f"Pokemon evolved from {poke['Name']} (ID {poke['ID']}) to {evolved_pokemon['Name']} (ID {evolved_pokemon['ID']}).")
-                print(f"{evolved_pokemon['Name']} was already present; releasing it immediately.")
-            else:
-                owner_node["pokedex"].append(evolved_pokemon)
-                print(f"Pokemon evolved from {poke['Name']} (ID {poke['ID']}) to {evolved_pokemon['Name']} (ID {evolved_pokemon['ID']}).")
-            return
+    print(f"Pokemon evolved from {poke.name} (ID {poke.id}) to {evolved_pokemon.name} (ID {evolved_pokemon.id}).")
+    # If the evolved pokemon is already present, release it.
+    if not evolve_species_for_owner(owner_node, poke, evolved_pokemon):
+        print(f"{evolved_pokemon.name} was already present; releasing it immediately.")
 
-    print(f"No Pokemon named '{poke_name}' in {owner_node['owner_original']}'s Pokedex.")
+def evolve_species_for_owner(owner_node, poke, evolved_pokemon):
+    """
+    Replaces 'poke' with 'evolved_pokemon' at the end of the Pokedex.
+    Returns False if the evolved form was already present (so the evolved
+    Pokemon is released instead of duplicated).
+    """
+    return ownerStore.replace_species(owner_node, [(poke, evolved_pokemon)])[0]
 
-def delete_pokedex():
-    global ownerRoot
+def evolve_all_for_owner(owner_node, final_form=False):
+    """
+    Evolves every evolvable Pokemon of the owner at once, one step or (with
+    final_form) straight to the end of its line, using the precomputed
+    evolution table. Evolved forms go to the end of the Pokedex in the
+    original order; forms already present are not duplicated.
+    Returns [(old Species, new Species), ...].
+    """
+    evolutions = get_catalog().evolutions
+    # Same lock order as OwnerStore: the tree lock before the owner's stripe
+    with ownerStore.lock.read(), ownerStore.owner_lock(owner_node):
+        changes = []
+        for poke in owner_node["pokedex"].values():
+            target = evolutions.final_form[poke.id] if final_form else evolutions.next_form(poke)
+            if target is not None and target is not poke:
+                changes.append((poke, target))
+        ownerStore.replace_species(owner_node, changes)
+    return changes
+
+def evolve_all_owners(final_form=False):
+    """Runs evolve_all_for_owner on every owner. Returns the number of evolutions."""
+    return sum(len(evolve_all_for_owner(owner_node, final_form))
+               for owner_node in ownerStore.owners())
 
+def delete_pokedex():
     # Get owner name
     owner_name = input("Enter owner to delete: ").strip()
 
     # Find the owner with the correct casing
-    owner_node = find_owner_bst(ownerRoot, owner_name.lower())
+    owner_node = ownerStore.find(owner_name)
 
     if owner_node is None:
         print(f"Owner '{owner_name}' not found.")
@@ -308,52 +627,407 @@ def delete_pokedex():
     original_name = owner_node["owner_original"]
 
     # Delete the owner from BST
-    ownerRoot = delete_owner_bst(ownerRoot, owner_name.lower())
+    unregister_owner(owner_node)
     print(f"Deleting {original_name}'s entire Pokedex...\nPokedex deleted.")
 
 ########################
 # 5) Sorting Owners by # of Pokemon
 ########################
 
-def gather_all_owners(root, arr):
-    if root is None:
-        return
+# A ranking is a SortedBlockList of (size, owner_lower, owner_node) entries,
+# ordered by (pokedex size, lowercase name); OwnerStore keeps one up to date.
+# Blocks keep re-filing an owner cheap however many owners there are.
+
+def new_ranking(sorted_entries=()):
+    return SortedBlockList(sorted_entries)
 
-    gather_all_owners(root["left"], arr)  # Visit left
-    arr.append(root)  # Store owner
-    gather_all_owners(root["right"], arr)  # Visit right
+def ranking_insert(ranking, owner_node):
+    ranking.add((len(owner_node["pokedex"]), owner_node["owner_lower"], owner_node))
 
+def ranking_remove(ranking, owner_node, size):
+    """
+    Removes the owner's entry, filed under 'size'. Returns False if the owner
+    is not ranked (e.g. a node that was never registered).
+    """
+    return ranking.remove((size, owner_node["owner_lower"]), lambda entry: entry[2] is owner_node)
+
+def ranking_update(ranking, owner_node, old_size):
+    """
+    Re-files the owner after its Pokedex size changed. Returns False if the
+    owner is not registered (and so should not be persisted either).
+    """
+    if ranking_remove(ranking, owner_node, old_size):
+        ranking_insert(ranking, owner_node)
+        return True
+    return False
+
+def ranking_top(ranking, n):
+    """
+    Returns the n owners with the most Pokemon (ties by name), reading only
+    the top of the ranking instead of materialising the whole list.
+    """
+    result = []
+    last = ranking.last()
+    while last is not None and len(result) < n:
+        # Entries with the same size are contiguous and already name-ordered
+        size = last[0]
+        i, j = ranking.locate((size,))
+        for entry in islice(ranking.iter_from(i, j), n - len(result)):
+            if entry[0] != size:
+                break
+            result.append(entry[2])
+        last = ranking.before(i, j)
+    return result
 
-def sort_owners_by_num_pokemon():
-    owners_list = []
-    gather_all_owners(ownerRoot, owners_list)
+def top_owners(n):
+    return ownerStore.top_owners(n)
 
-    if not owners_list:
+
+def sort_owners_by_num_pokemon(top_n=None, writer=None):
+    if not ownerStore.ranking:
         print("No owners at all.")
         return
 
-    n = len(owners_list)
-    for i in range(n):
-        for j in range(0, n - i - 1):
-            owner1 = owners_list[j]
-            owner2 = owners_list[j + 1]
+    if top_n is not None:
+        title = f"=== Top {top_n} Owners by number of Pokemons ==="
+        owners_list = top_owners(top_n)
+    else:
+        title = "=== The Owners we have, sorted by number of Pokemons ==="
+        owners_list = ownerStore.ranked_owners()
 
-            if len(owner1["pokedex"]) > len(owner2["pokedex"]) or (
-                len(owner1["pokedex"]) == len(owner2["pokedex"]) and owner1["owner_lower"] > owner2["owner_lower"]
-            ):
-                owners_list[j], owners_list[j + 1] = owners_list[j + 1], owners_list[j]
+    own_writer = writer is None
+    if own_writer:
+        writer = LineWriter()
+    write_ranking(writer, owners_list, renderFormat, title)
+    if own_writer:
+        writer.flush()
 
-    print("=== The Owners we have, sorted by number of Pokemons ===")
-    for owner in owners_list:
-        print(f"Owner: {owner['owner_original']} (has {len(owner['pokedex'])} Pokemon)\n")
+########################
+# 6) Owner Store
+########################
+
+class ReadWriteLock:
+    """
+    Any number of readers or a single writer. Waiting writers hold off new
+    readers so they cannot be starved. A thread may re-enter the lock it
+    already holds (including taking a read lock while writing).
+    """
+
+    def __init__(self):
+        self.cond = threading.Condition(threading.Lock())
+        self.readers = 0
+        self.writer = None  # Ident of the thread holding the write lock
+        self.waiting_writers = 0
+        self.local = threading.local()
+
+    @contextmanager
+    def read(self):
+        # Per thread, 'depth' counts the open reads and 'shared' tells whether
+        # the outermost one took a reader slot. Reads may close in any order
+        # (owners() generators), so the slot is given back only at depth 0.
+        local = self.local
+        if not getattr(local, "depth", 0):
+            local.shared = self.writer != threading.get_ident()
+            if local.shared:
+                with self.cond:
+                    while self.writer is not None or self.waiting_writers:
+                        self.cond.wait()
+                    self.readers += 1
+            local.depth = 0
+        local.depth += 1
+        try:
+            yield
+        finally:
+            local.depth -= 1
+            if not local.depth and local.shared:
+                with self.cond:
+                    self.readers -= 1
+                    if not self.readers:
+                        self.cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        if self.writer == me:
+            yield
+            return
+
+        with self.cond:
+            self.waiting_writers += 1
+            while self.writer is not None or self.readers:
+                self.cond.wait()
+            self.waiting_writers -= 1
+            self.writer = me
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.writer = None
+                self.cond.notify_all()
+
+
+class OwnerStore:
+    """
+    The owner BST together with everything kept in step with it: the
+    ranking, the fleet-wide statistics (OwnerAggregates), the species ->
+    owners index (SpeciesOwnerIndex) and, optionally, the database. Safe to
+    share between threads:
+      - adding/removing owners takes the write lock on the tree;
+      - lookups and traversals take the read lock, so they run concurrently;
+      - Pokedex edits take the read lock plus the owner's lock, so edits to
+        different owners run concurrently and never race a delete;
+      - the ranking, the database and the statistics + index (one lock)
+        have short internal locks.
+    Owner locks are striped: owners share a fixed pool of locks by name hash.
+    """
+
+    OWNER_LOCK_STRIPES = 64
+
+    def __init__(self, db=None):
+        self.root = None
+        self.ranking = new_ranking()
+        self.stats = OwnerAggregates()
+        self.index = SpeciesOwnerIndex()
+        self.stat_index = StatIndex()
+        self.db = db
+        self.lock = ReadWriteLock()
+        self.ranking_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.db_lock = threading.Lock()
+        self.owner_locks = [threading.RLock() for _ in range(self.OWNER_LOCK_STRIPES)]
+
+    def owner_lock(self, owner_node):
+        return self.owner_locks[hash(owner_node["owner_lower"]) % self.OWNER_LOCK_STRIPES]
+
+    def find(self, owner_name):
+        with self.lock.read():
+            return find_owner_bst(self.root, owner_name)
+
+    def owners(self, order="in"):
+        """
+        Yields owner nodes in "bfs", "pre", "in" or "post" order. The read lock
+        is held until the generator is exhausted or closed.
+        """
+        traversal = {"bfs": bfs_owners, "pre": pre_order_owners,
+                     "in": in_order_owners, "post": post_order_owners}[order]
+        with self.lock.read():
+            yield from traversal(self.root)
+
+    def insert_owner(self, owner_node):
+        with self.lock.write():
+            if find_owner_bst(self.root, owner_node["owner_lower"]) is not None:
+                return False
+            self.root = insert_owner_bst(self.root, owner_node)
+            with self.ranking_lock:
+                ranking_insert(self.ranking, owner_node)
+            with self.stats_lock:
+                self.stats.add_owner(owner_node)
+                self.index.add_owner(owner_node)
+                self.stat_index.add_owner(owner_node)
+            if self.db is not None:
+                with self.db_lock:
+                    db_insert_owner(self.db, owner_node["owner_lower"], owner_node["owner_original"],
+                                    owner_node["pokedex"], owner_node["starter"])
+        return True
+
+    def remove_owner(self, owner_node):
+        with self.lock.write():
+            if find_owner_bst(self.root, owner_node["owner_lower"]) is not owner_node:
+                return False
+            with self.owner_lock(owner_node):  # Let in-flight edits finish first
+                with self.ranking_lock:
+                    ranking_remove(self.ranking, owner_node, len(owner_node["pokedex"]))
+                with self.stats_lock:
+                    self.stats.remove_owner(owner_node)
+                    self.index.remove_owner(owner_node)
+                    self.stat_index.remove_owner(owner_node)
+                self.root = delete_owner_bst(self.root, owner_node["owner_lower"])
+                if self.db is not None:
+                    with self.db_lock:
+                        db_delete_owner(self.db, owner_node["owner_lower"])
+        return True
+
+    def add_species(self, owner_node, pokemon):
+        with self.lock.read(), self.owner_lock(owner_node):
+            if pokemon.id in owner_node["pokedex"]:
+                return False
+            old_size = len(owner_node["pokedex"])
+            owner_node["pokedex"][pokemon.id] = pokemon
+            if self.pokedex_changed(owner_node, old_size):
+                with self.stats_lock:
+                    self.stats.add_pokemon(pokemon)
+                    self.index.add(owner_node, pokemon.id)
+                    self.stat_index.add(owner_node, pokemon.id)
+        return True
+
+    def remove_species(self, owner_node, pokemon):
+        with self.lock.read(), self.owner_lock(owner_node):
+            if pokemon.id not in owner_node["pokedex"]:
+                return False
+            old_size = len(owner_node["pokedex"])
+            del owner_node["pokedex"][pokemon.id]
+            if self.pokedex_changed(owner_node, old_size):
+                with self.stats_lock:
+                    self.stats.remove_pokemon(pokemon)
+                    self.index.remove(owner_node, pokemon.id)
+                    self.stat_index.remove(owner_node, pokemon.id)
+        return True
+
+    def replace_species(self, owner_node, changes):
+        """
+        Removes the old Species of every (old, new) pair in 'changes', then
+        adds the new ones, as one edit (evolutions). Removing everything first
+        keeps evolutions within the same line independent of Pokedex order.
+        Returns, per pair, whether the new Species was added (False if present).
+        """
+        with self.lock.read(), self.owner_lock(owner_node):
+            for poke, _ in changes:
+                self.remove_species(owner_node, poke)
+            return [self.add_species(owner_node, target) for _, target in changes]
+
+    def pokedex_changed(self, owner_node, old_size):
+        """
+        Brings the ranking and database in line with an edited Pokedex (owner
+        lock held). Returns False if the owner is not registered.
+        """
+        with self.ranking_lock:
+            registered = ranking_update(self.ranking, owner_node, old_size)
+        if registered and self.db is not None:
+            with self.db_lock:
+                db_save_pokedex(self.db, owner_node["owner_lower"], owner_node["pokedex"])
+        return registered
+
+    def top_owners(self, n):
+        with self.ranking_lock:
+            return ranking_top(self.ranking, n)
+
+    def ranked_owners(self):
+        """A snapshot of every owner, by (pokedex size, name)."""
+        with self.ranking_lock:
+            return [entry[2] for entry in self.ranking]
+
+    def statistics(self, top=5):
+        """Fleet-wide summary from the live counters; never walks the owners."""
+        by_id = get_catalog().by_id
+        with self.stats_lock:
+            return summarize(self.stats, lambda species_id: by_id[species_id].name, top)
+
+    def aggregates(self):
+        """A copy of the raw statistics counters (see OwnerAggregates.as_dict)."""
+        with self.stats_lock:
+            return self.stats.as_dict()
+
+    def owners_holding(self, species_id):
+        with self.stats_lock:
+            return self.stats.owners_holding(species_id)
+
+    def owners_with(self, all_of=(), any_of=(), limit=None):
+        """
+        Owners holding every species ID in 'all_of' and at least one in
+        'any_of' (see SpeciesOwnerIndex.match), in no particular order.
+        Returns (number of matches, up to 'limit' owner nodes).
+        """
+        with self.stats_lock:
+            mask = self.index.match(all_of, any_of)
+            return mask.bit_count(), self.index.owners(mask, limit)
+
+    def strongest(self, stat, k):
+        """
+        The k owned Pokemon with the highest 'stat' ("hp" or "attack") across
+        every owner, as (owner node, Species) pairs; see StatIndex.top.
+        """
+        order = get_catalog().stat_orders[stat]
+        with self.stats_lock:
+            return self.stat_index.top(order, k)
+
+    def stat_range(self, stat, low=None, high=None, limit=None):
+        """
+        Owned Pokemon with 'stat' in [low, high], as (number of matches,
+        up to 'limit' (owner node, Species) pairs); see StatIndex.range.
+        """
+        order = get_catalog().stat_orders[stat]
+        with self.stats_lock:
+            return self.stat_index.range(order, low, high, limit)
+
+    def verify_statistics(self):
+        """Recomputes the statistics from every Pokedex and compares them with the counters."""
+        with self.lock.write():  # Hold off edits so both sides see the same owners
+            fresh = compute_aggregates(in_order_owners(self.root), get_catalog().data)
+            with self.stats_lock:
+                return fresh.as_dict() == self.stats.as_dict()
+
+    def bulk_insert(self, owner_nodes):
+        """
+        Adds many new owners at once. When they are many compared with the
+        store (m log n >= n), the new names are merged with the existing ones
+        and the tree, ranking and stat index are rebuilt, in O(n + m) for
+        name-sorted input; a few owners go in with one AVL insert each, in
+        O(m log n). Owners whose name is taken (or repeated in 'owner_nodes')
+        are skipped. Nothing changes if any step fails. Returns the number added.
+        """
+        new_nodes = sorted_unique_owners(owner_nodes)
+        with self.lock.write(), self.ranking_lock, self.stats_lock:
+            was_empty = self.root is None
+            size = len(self.ranking)
+            rebuild = len(new_nodes) * size.bit_length() >= size
+            if was_empty:
+                merged = added = new_nodes
+            elif rebuild:
+                merged, added = merge_owner_runs(in_order_owners(self.root), new_nodes)
+            else:
+                added = [node for node in new_nodes if find_owner_bst(self.root, node["owner_lower"]) is None]
+            if not added:
+                return 0
+            # Build everything aside first: a bad node must leave the store as it was
+            added_stats = compute_aggregates(added, get_catalog().data)
+            if rebuild:
+                ranking = new_ranking(merge(self.ranking, sorted((len(node["pokedex"]), node["owner_lower"], node)
+                                                                 for node in added)))
+                index = SpeciesOwnerIndex.build(added) if was_empty else None
+                stat_index = StatIndex.build(merged)  # Cheaper than one insert per new Pokemon
+            if self.db is not None:
+                with self.db_lock:
+                    db_insert_owners(self.db, ((node["owner_lower"], node["owner_original"],
+                                                node["pokedex"], node["starter"]) for node in added))
+
+            self.stats.add_aggregates(added_stats)
+            if rebuild:
+                self.root = build_balanced_owner_tree(merged)
+                self.ranking = ranking
+                self.stat_index = stat_index
+            else:
+                for node in added:
+                    self.root = insert_owner_bst(self.root, node)
+                    ranking_insert(self.ranking, node)
+                    self.stat_index.add_owner(node)
+            if was_empty:
+                self.index = index
+            else:
+                for node in added:
+                    self.index.add_owner(node)
+        return len(added)
+
+    def load(self, sorted_nodes, db=None):
+        """Replaces the contents with owner nodes already sorted by name."""
+        with self.lock.write(), self.ranking_lock, self.stats_lock:
+            self.root = build_balanced_owner_tree(sorted_nodes)
+            self.ranking = new_ranking(sorted((len(node["pokedex"]), node["owner_lower"], node)
+                                              for node in sorted_nodes))
+            self.stats = compute_aggregates(sorted_nodes, get_catalog().data)
+            self.index = SpeciesOwnerIndex.build(sorted_nodes)
+            self.stat_index = StatIndex.build(sorted_nodes)
+            self.db = db
+
+
+# The store behind the menus, the batch commands and the module-level helpers
+ownerStore = OwnerStore()
 
 #######################
-# 6) Print All
+# 7) Print All
 #######################
 
 def print_all_owners():
-    global ownerRoot
-    if ownerRoot is None:
+    if ownerStore.root is None:
         print("No owners in the BST.")
         return  # Exit back to the main menu immediately
 
@@ -367,60 +1041,18 @@ def print_all_owners():
     print()
 
     if choice == 1:
-        bfs_traversal(ownerRoot)
+        print_owners(ownerStore.owners("bfs"))
     elif choice == 2:
-        pre_order(ownerRoot)
+        print_owners(ownerStore.owners("pre"), "\n")
     elif choice == 3:
-        in_order(ownerRoot)
+        print_owners(ownerStore.owners("in"), "\n")
     elif choice == 4:
-        post_order(ownerRoot)
+        print_owners(ownerStore.owners("post"), "\n")
     else:
         print("Invalid choice.")
 
-def pre_order_print(node):
-    if node is None:
-        return
-
-    # Print owner and their Pokemon
-    print(f"\nOwner: {node['owner'].capitalize()}\n")
-    if node["pokedex"]:
-        display_pokemon_list(node["pokedex"])
-    else:
-        print("There are no Pokemons in this Pokedex that match the criteria.")
-
-    # Recurse left and right
-    pre_order_print(node["left"])
-    pre_order_print(node["right"])
-
-def in_order_print(node):
-    if node is None:
-        return
-
-    in_order_print(node["left"])
-
-    print(f"\nOwner: {node['owner'].capitalize()}\n")
-    if node["pokedex"]:
-        display_pokemon_list(node["pokedex"])
-    else:
-        print("There are no Pokemons in this Pokedex that match the criteria.")
-
-    in_order_print(node["right"])
-
-def post_order_print(node):
-    if node is None:
-        return
-
-    post_order_print(node["left"])
-    post_order_print(node["right"])
-
-    print(f"\nOwner: {node['owner'].capitalize()}\n")
-    if node["pokedex"]:
-        display_pokemon_list(node["pokedex"])
-    else:
-        print("There are no Pokemons in this Pokedex that match the criteria.")
-
 ########################
-# 7) The Display Filter Sub-Menu
+# 8) The Display Filter Sub-Menu
 ########################
 def read_int_allow_negative(prompt):
     while True:
@@ -432,6 +1064,84 @@ def read_int_allow_negative(prompt):
 
         print("Invalid input.")
 
+# Filters combine any of these criteria (None = not used) with AND:
+#   poke_type    : Type, case-insensitive
+#   evolvable    : True / False
+#   min_attack   : Attack >= min_attack
+#   min_hp       : HP >= min_hp
+#   name_prefix  : Name starts with this, case-insensitive
+# The criteria are evaluated once over the catalog's column arrays (or, with
+# a name prefix, over just the species the prefix index returns), giving the
+# set of matching species; each owner's Pokedex is then filtered with a
+# single set probe per entry, in one pass.
+
+QUERY_CACHE_LIMIT = 256
+
+def matching_species_ids(poke_type=None, evolvable=None, min_attack=None, min_hp=None, name_prefix=None):
+    catalog = get_catalog()
+    key = (poke_type and poke_type.casefold(), evolvable, min_attack, min_hp,
+           name_prefix and name_prefix.casefold())
+    ids = catalog.query_cache.get(key)
+    if ids is not None:
+        return ids
+
+    poke_type, evolvable, min_attack, min_hp, name_prefix = key
+    columns = catalog.columns
+    np = optional_numpy()
+
+    if name_prefix:
+        ids = frozenset(
+            poke.id for poke in catalog.species_with_prefix(name_prefix)
+            if (poke_type is None or poke.type.casefold() == poke_type)
+            and (evolvable is None or poke.can_evolve == evolvable)
+            and (min_attack is None or poke.attack >= min_attack)
+            and (min_hp is None or poke.hp >= min_hp)
+        )
+    elif np is not None:
+        mask = np.ones(len(columns["id"]), dtype=bool)
+        if poke_type is not None:
+            if poke_type in columns["type_names"]:
+                mask &= columns["type_code"] == columns["type_names"].index(poke_type)
+            else:
+                mask[:] = False
+        if evolvable is not None:
+            mask &= columns["can_evolve"] == evolvable
+        if min_attack is not None:
+            mask &= columns["attack"] >= min_attack
+        if min_hp is not None:
+            mask &= columns["hp"] >= min_hp
+        ids = frozenset(columns["id"][mask].tolist())
+    else:
+        ids = frozenset(
+            poke.id for poke in catalog.data
+            if (poke_type is None or poke.type.casefold() == poke_type)
+            and (evolvable is None or poke.can_evolve == evolvable)
+            and (min_attack is None or poke.attack >= min_attack)
+            and (min_hp is None or poke.hp >= min_hp)
+        )
+
+    if len(catalog.query_cache) >= QUERY_CACHE_LIMIT:
+        catalog.query_cache.clear()
+    catalog.query_cache[key] = ids
+    return ids
+
+def filter_pokedex(owner_node, **criteria):
+    """Returns the owner's Pokemon matching every given criterion, in Pokedex order."""
+    pokedex = owner_node["pokedex"]
+    if not any(value is not None for value in criteria.values()):
+        return list(pokedex.values())
+
+    ids = matching_species_ids(**criteria)
+    return [poke for poke_id, poke in pokedex.items() if poke_id in ids]
+
+def filter_all_owners(**criteria):
+    """Yields (owner_node, matches) for every owner with at least one match, by name."""
+    ids = matching_species_ids(**criteria)
+    for owner_node in ownerStore.owners():
+        matches = [poke for poke_id, poke in owner_node["pokedex"].items() if poke_id in ids]
+        if matches:
+            yield owner_node, matches
+
 def display_filter_sub_menu(owner_node):
     while True:
         print("\n-- Display Filter Menu --")
@@ -447,20 +1157,20 @@ def display_filter_sub_menu(owner_node):
 
         if choice == 1:
             poke_type = input("Which Type? (e.g. GRASS, WATER): ").strip().lower()
-            filtered = [p for p in owner_node["pokedex"] if p["Type"].lower() == poke_type]
+            filtered = filter_pokedex(owner_node, poke_type=poke_type)
         elif choice == 2:
-            filtered = [p for p in owner_node["pokedex"] if p["Can Evolve"] == "TRUE"]
+            filtered = filter_pokedex(owner_node, evolvable=True)
         elif choice == 3:
             attack_threshold = read_int_allow_negative("Enter Attack threshold: ")
-            filtered = [p for p in owner_node["pokedex"] if p["Attack"] >= attack_threshold]
+            filtered = filter_pokedex(owner_node, min_attack=attack_threshold)
         elif choice == 4:
             hp_threshold = read_int_allow_negative("Enter HP threshold: ")
-            filtered = [p for p in owner_node["pokedex"] if p["HP"] >= hp_threshold]
+            filtered = filter_pokedex(owner_node, min_hp=hp_threshold)
         elif choice == 5:
             prefix = input("Starting letter(s): ").strip().lower()
-            filtered = [p for p in owner_node["pokedex"] if p["Name"].lower().startswith(prefix)]
+            filtered = filter_pokedex(owner_node, name_prefix=prefix)
         elif choice == 6:
-            filtered = owner_node["pokedex"]  # Show all
+            filtered = filter_pokedex(owner_node)  # Show all
         elif choice == 7:
             print("Back to Pokedex Menu.")
             return
@@ -471,9 +1181,615 @@ def display_filter_sub_menu(owner_node):
         if filtered:
             display_pokemon_list(filtered)
         else:
-            print("There are no Pokemons in this Pokedex that match the criteria.")
+            print(NO_MATCH_MESSAGE)
+########################
+# 9) Saving & Loading
+########################
+
+def stored_owner_node(owner_original, species_ids, starter, by_id):
+    """
+    Owner node from saved species IDs (database rows, dumps). IDs no longer
+    in the catalog are skipped, and such a starter becomes None, so the
+    statistics never meet a species they cannot name.
+    """
+    node = create_owner_node(owner_original)
+    node["pokedex"] = {species_id: by_id[species_id] for species_id in species_ids if species_id in by_id}
+    node["starter"] = starter if starter in by_id else None
+    return node
+
+def load_owners_from_db(path):
+    """
+    Opens the owner database at 'path', replaces the in-memory owners with
+    its contents and keeps it open so every later change is written through.
+    """
+    conn = open_db(path)
+    by_id = get_catalog().by_id
+    nodes = []
+
+    # Building millions of small dicts would otherwise trigger the cyclic
+    # garbage collector over and over; none of them can be garbage yet.
+    gc.disable()
+    try:
+        for owner_original, species_ids, starter in db_load_owners(conn):
+            nodes.append(stored_owner_node(owner_original, species_ids, starter, by_id))
+
+        # Rows arrive sorted by owner name, so the tree is built directly
+        ownerStore.load(nodes, conn)
+    finally:
+        gc.enable()
+
+# Dumps hold one owner per line, in name order, with species as IDs:
+#   jsonl : {"owner": "Ash", "starter": 258, "pokedex": [258, 263]}
+#   csv   : owner,starter,pokedex  ->  Ash,258,258;263
+# Both are written and read lazily, a chunk of lines at a time.
+
+DUMP_CSV_HEADER = "owner,starter,pokedex"
+
+def dump_lines(owner_nodes, fmt="jsonl"):
+    """Yields one dump line per owner node."""
+    import json
+
+    if fmt == "csv":
+        yield DUMP_CSV_HEADER
+        for node in owner_nodes:
+            starter = node["starter"]
+            yield (f"{csv_field(node['owner_original'])},{'' if starter is None else starter},"
+                   f"{';'.join(map(str, node['pokedex']))}")
+        return
+
+    # Built by hand like write_owners' JSON: only the name needs escaping
+    for node in owner_nodes:
+        starter = node["starter"]
+        yield (f'{{"owner":{json.dumps(node["owner_original"], ensure_ascii=False)},'
+               f'"starter":{"null" if starter is None else starter},'
+               f'"pokedex":[{",".join(map(str, node["pokedex"]))}]}}')
+
+def export_owners(stream, fmt="jsonl", chunk_lines=4096):
+    """Writes every owner to 'stream' as a dump, walking the tree lazily. Returns the count."""
+    writer = LineWriter(stream, chunk_lines)
+    count = -1 if fmt == "csv" else 0  # Not counting the header
+    for line in dump_lines(ownerStore.owners("in"), fmt):
+        writer.write(line)
+        count += 1
+    writer.flush()
+    return count
+
+def read_dump(stream, fmt="jsonl"):
+    """
+    Yields an owner node per dump line. Species no longer in the catalog are
+    skipped (an unknown starter becomes None); a malformed line raises
+    ValueError naming its line number. Species IDs must be integers: 4.0 or true would hash like an ID but
+    could not be exported or saved again.
+    """
+    import json
+
+    by_id = get_catalog().by_id
+
+    def owner_node(owner, starter, species_ids):
+        owner = str(owner or "").strip()
+        if not owner:
+            raise ValueError("missing owner")
+        for value in (starter, *species_ids):
+            if value is not None and type(value) is not int:
+                raise ValueError(f"species IDs must be integers, got {value!r}")
+        return stored_owner_node(owner, species_ids, starter, by_id)
+
+    if fmt == "csv":
+        import csv
+        reader = csv.DictReader(stream)
+        for row in reader:
+            try:
+                pokedex = row.get("pokedex") or ""
+                starter = row.get("starter")
+                yield owner_node(row.get("owner"), int(starter) if starter else None,
+                                 list(map(int, pokedex.split(";"))) if pokedex else ())
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"line {reader.line_num}: {e}") from None
+        return
+
+    decode = json.JSONDecoder().decode
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = decode(line)
+            yield owner_node(record.get("owner"), record.get("starter"), record.get("pokedex") or ())
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"line {line_number}: {e}") from None
+
+def export_owners_file(path, fmt="jsonl"):
+    out_stream = sys.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+    try:
+        count = export_owners(out_stream, fmt)
+    finally:
+        if out_stream is not sys.stdout:
+            out_stream.close()
+    print(f"{count} owners exported.", file=sys.stderr)
+
+def import_owners_file(path, fmt="jsonl"):
+    """Adds the owners dumped in 'path' ('-' for stdin) with one bulk insert. Returns the number added."""
+    in_stream = sys.stdin if path == "-" else open(path, encoding="utf-8", newline="")
+    gc.disable()  # As in load_owners_from_db: nothing built here can be garbage yet
+    try:
+        added = ownerStore.bulk_insert(read_dump(in_stream, fmt))
+    finally:
+        gc.enable()
+        if in_stream is not sys.stdin:
+            in_stream.close()
+    print(f"{added} owners imported.", file=sys.stderr)
+    return added
+
+########################
+# 10) Batch Commands
+########################
+
+# Non-interactive access to the same operations as the menus. A command is
+# a dict such as {"op": "add", "owner": "Ash", "pokemon": "Mudkip"}:
+#   create      owner, starter (Treecko / Torchic / Mudkip, name or ID)
+#   add         owner, pokemon (name or ID)
+#   release     owner, pokemon
+#   evolve      owner, pokemon, [final]
+#   evolve_all  [owner], [final]      (no owner = every owner)
+#   delete      owner
+#   find        owner
+#   query       [owner], [type], [evolvable], [min_attack], [min_hp], [prefix]
+#   ranking     [top]
+#   stats       [top], [pokemon], [verify], [owner]  (owner: that owner's average HP/Attack)
+#   holders     [all], [any], [limit]  (lists of Pokemon names or IDs)
+#   strongest   [stat], [top]          (stat: attack (default) or hp)
+#   stat_range  [stat], [min], [max], [limit]
+#               (both list owned Pokemon as [owner, Pokemon, ID, stat value])
+#   health      (tree shape, plus call metrics when enabled)
+# apply_command returns a JSON-ready result or raises CommandError.
+# The same commands drive --batch files and the --serve network service.
+
+STARTER_NAMES = ("Treecko", "Torchic", "Mudkip")
+
+class CommandError(Exception):
+    pass
+
+def command_arg(command, key, required=True):
+    value = command.get(key)
+    if value is None or value == "":
+        if required:
+            raise CommandError(f"missing '{key}'")
+        return None
+    return value
+
+def command_int(command, key):
+    value = command_arg(command, key, required=False)
+    if value is None or (isinstance(value, int) and not isinstance(value, bool)):
+        return value
+    if isinstance(value, str):  # CSV batch files hold every field as text
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    # No bools or floats: int() would quietly turn true into 1 and 3.7 into 3
+    raise CommandError(f"'{key}' must be an integer, got {value!r}")
+
+def command_count(command, key):
+    value = command_int(command, key)
+    if value is not None and value < 0:
+        raise CommandError(f"'{key}' must not be negative, got {value}")
+    return value
+
+def command_str(command, key, required=False):
+    value = command_arg(command, key, required)
+    if value is not None and not isinstance(value, str):
+        raise CommandError(f"'{key}' must be a string, got {value!r}")
+    return value
+
+def command_bool(command, key):
+    value = command_arg(command, key, required=False)
+    if value is None or isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("1", "true", "yes"):
+        return True
+    if text in ("0", "false", "no"):
+        return False
+    raise CommandError(f"'{key}' must be true or false, got {value!r}")
+
+def command_species(command, key="pokemon"):
+    value = command_arg(command, key)
+    catalog = get_catalog()
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise CommandError(f"'{key}' must be a Pokemon name or ID, got {value!r}")
+    if isinstance(value, int) or value.strip().isdecimal():
+        pokemon = catalog.by_id.get(int(value))
+    else:
+        pokemon = catalog.by_name.get(value.strip().casefold())
+    if pokemon is None:
+        raise CommandError(f"unknown Pokemon {value!r}")
+    return pokemon
+
+def command_owner(command):
+    owner_name = command_str(command, "owner", required=True).strip()
+    owner_node = ownerStore.find(owner_name)
+    if owner_node is None:
+        raise CommandError(f"owner {owner_name!r} not found")
+    return owner_node
+
+def pokemon_names(poke_list):
+    return [poke.name for poke in poke_list]
+
+def command_create(command):
+    owner_name = command_str(command, "owner", required=True).strip()
+    if not owner_name:
+        raise CommandError("missing 'owner'")
+    starter = command_species(command, "starter")
+    if starter.name not in STARTER_NAMES:
+        raise CommandError(f"starter must be one of {', '.join(STARTER_NAMES)}")
+    if not register_owner(create_owner_node(owner_name, starter)):
+        raise CommandError(f"owner {owner_name!r} already exists")
+    return {"owner": owner_name, "starter": starter.name}
+
+def command_add(command):
+    owner_node = command_owner(command)
+    pokemon = command_species(command)
+    if not add_species_to_owner(owner_node, pokemon):
+        raise CommandError(f"{pokemon.name} already in {owner_node['owner_original']}'s Pokedex")
+    return {"owner": owner_node["owner_original"], "added": pokemon.name}
+
+def command_release(command):
+    owner_node = command_owner(command)
+    pokemon = command_species(command)
+    if not remove_species_from_owner(owner_node, pokemon):
+        raise CommandError(f"no {pokemon.name} in {owner_node['owner_original']}'s Pokedex")
+    return {"owner": owner_node["owner_original"], "released": pokemon.name}
+
+def command_evolve(command):
+    owner_node = command_owner(command)
+    pokemon = command_species(command)
+    if not owner_has_pokemon(owner_node, pokemon.id):
+        raise CommandError(f"no {pokemon.name} in {owner_node['owner_original']}'s Pokedex")
+
+    evolutions = get_catalog().evolutions
+    if command_bool(command, "final"):
+        evolved_pokemon = evolutions.final_form[pokemon.id]
+        if evolved_pokemon is pokemon:
+            evolved_pokemon = None
+    else:
+        evolved_pokemon = evolutions.next_form(pokemon)
+    if evolved_pokemon is None:
+        raise CommandError(f"{pokemon.name} cannot evolve further")
+
+    added = evolve_species_for_owner(owner_node, pokemon, evolved_pokemon)
+    return {"owner": owner_node["owner_original"], "from": pokemon.name,
+            "to": evolved_pokemon.name, "already_present": not added}
+
+def command_evolve_all(command):
+    final_form = bool(command_bool(command, "final"))
+    if command_arg(command, "owner", required=False) is None:
+        return {"evolved": evolve_all_owners(final_form)}
+    owner_node = command_owner(command)
+    return {"owner": owner_node["owner_original"],
+            "evolved": len(evolve_all_for_owner(owner_node, final_form))}
+
+def command_delete(command):
+    owner_node = command_owner(command)
+    unregister_owner(owner_node)
+    return {"deleted": owner_node["owner_original"]}
+
+def command_find(command):
+    owner_node = command_owner(command)
+    return {"owner": owner_node["owner_original"],
+            "pokedex": pokemon_names(owner_node["pokedex"].values())}
+
+def command_query(command):
+    criteria = {
+        "poke_type": command_str(command, "type"),
+        "evolvable": command_bool(command, "evolvable"),
+        "min_attack": command_int(command, "min_attack"),
+        "min_hp": command_int(command, "min_hp"),
+        "name_prefix": command_str(command, "prefix"),
+    }
+    if command_arg(command, "owner", required=False) is None:
+        return {"owners": {owner_node["owner_original"]: pokemon_names(matches)
+                           for owner_node, matches in filter_all_owners(**criteria)}}
+    owner_node = command_owner(command)
+    return {"owner": owner_node["owner_original"],
+            "pokemon": pokemon_names(filter_pokedex(owner_node, **criteria))}
+
+def command_ranking(command):
+    top_n = command_count(command, "top")
+    if top_n is not None:
+        owners = top_owners(top_n)
+    else:
+        owners = ownerStore.ranked_owners()
+    return {"ranking": [[owner_node["owner_original"], len(owner_node["pokedex"])] for owner_node in owners]}
+
+def command_stats(command):
+    top_n = command_count(command, "top")
+    result = ownerStore.statistics(5 if top_n is None else top_n)
+    if command_arg(command, "pokemon", required=False) is not None:
+        pokemon = command_species(command)
+        result["owners_holding"] = [pokemon.name, ownerStore.owners_holding(pokemon.id)]
+    if command_bool(command, "verify"):
+        result["consistent"] = ownerStore.verify_statistics()
+    if command_arg(command, "owner", required=False) is not None:
+        result["owner_averages"] = owner_average_stats(command_owner(command))
+    return result
+
+def owner_average_stats(owner_node):
+    average_hp, average_attack = owner_averages(owner_node)
+    return {"owner": owner_node["owner_original"], "average_hp": average_hp, "average_attack": average_attack}
+
+def command_species_list(command, key):
+    value = command_arg(command, key, required=False)
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(";")  # CSV batch files: "Latios;Latias"
+    elif not isinstance(value, list):
+        value = [value]
+    return [command_species({key: item}, key).id for item in value]
+
+def command_holders(command):
+    all_of = command_species_list(command, "all")
+    any_of = command_species_list(command, "any")
+    if not all_of and not any_of:
+        raise CommandError("give 'all' and/or 'any'")
+    limit = command_count(command, "limit")
+    count, owners = ownerStore.owners_with(all_of, any_of)
+    # The first 'limit' by name (tree order), so sharded stores can merge per-shard answers
+    if limit is None:
+        owners = sorted(owners, key=owner_key)
+    else:
+        owners = nsmallest(limit, owners, key=owner_key)
+    return {"count": count, "owners": [owner_node["owner_original"] for owner_node in owners]}
+
+STATS = ("attack", "hp")
+
+def command_stat(command):
+    stat = str(command_arg(command, "stat", required=False) or "attack").strip().lower()
+    if stat not in STATS:
+        raise CommandError(f"'stat' must be one of {', '.join(STATS)}, got {stat!r}")
+    return stat
+
+def stat_entries(pairs, stat):
+    return [[owner_node["owner_original"], poke.name, poke.id, getattr(poke, stat)] for owner_node, poke in pairs]
+
+def command_strongest(command):
+    stat = command_stat(command)
+    top_n = command_count(command, "top")
+    return {"pokemon": stat_entries(ownerStore.strongest(stat, 10 if top_n is None else top_n), stat)}
+
+def command_stat_range(command):
+    stat = command_stat(command)
+    count, pairs = ownerStore.stat_range(stat, command_int(command, "min"), command_int(command, "max"),
+                                         command_count(command, "limit"))
+    return {"count": count, "pokemon": stat_entries(pairs, stat)}
+
+def command_health(command):
+    return {"tree": tree_health(),
+            "metrics": ownerMetrics.snapshot() if ownerMetrics is not None else None}
+
+COMMANDS = {
+    "create": command_create,
+    "add": command_add,
+    "release": command_release,
+    "evolve": command_evolve,
+    "evolve_all": command_evolve_all,
+    "delete": command_delete,
+    "find": command_find,
+    "query": command_query,
+    "ranking": command_ranking,
+    "stats": command_stats,
+    "holders": command_holders,
+    "strongest": command_strongest,
+    "stat_range": command_stat_range,
+    "health": command_health,
+}
+
+def apply_command(command):
+    if not isinstance(command, dict):
+        raise CommandError("command must be an object")
+    op = command.get("op")
+    handler = COMMANDS.get(op) if isinstance(op, str) else None
+    if handler is None:
+        raise CommandError(f"unknown op {command.get('op')!r}")
+    return handler(command)
+
+def command_response(command):
+    """Applies one command and wraps the outcome as {"ok": ..., "result"/"error": ...}."""
+    try:
+        if isinstance(command, CommandError):
+            raise command
+        return {"ok": True, "result": apply_command(command)}
+    except CommandError as e:
+        return {"ok": False, "error": str(e)}
+    except Exception as e:
+        # A bug or an argument no check caught: fail this command, not the whole batch or connection
+        return {"ok": False, "error": f"internal error: {type(e).__name__}: {e}"}
+
+def read_commands(stream, fmt="jsonl"):
+    """
+    Yields (line_number, command) from a JSONL stream (one object per line)
+    or a CSV stream whose header names the fields (op,owner,pokemon,...).
+    Lines that cannot be parsed are yielded as (line_number, CommandError).
+    """
+    import json
+
+    if fmt == "csv":
+        import csv
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {key: value for key, value in row.items() if value not in (None, "")}
+        return
+
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except (ValueError, RecursionError) as e:
+            yield line_number, CommandError(f"invalid JSON: {e}")
+
+def run_commands(commands, out, chunk_lines=4096, respond_many=None):
+    """
+    Applies (line_number, command) pairs in order and writes one JSON result
+    per command to 'out', buffered in chunks. Returns (succeeded, failed).
+    'respond_many' answers a chunk of commands at once (e.g. a
+    ShardedOwnerStore); by default they run here, one by one.
+    """
+    import json
+
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    succeeded = failed = 0
+    chunk = []
+
+    def write_chunk():
+        nonlocal succeeded, failed
+        if respond_many is None:
+            responses = [command_response(command) for _, command in chunk]
+        else:
+            responses = respond_many([command for _, command in chunk])
+        lines = []
+        for (line_number, _), response in zip(chunk, responses):
+            if response["ok"]:
+                succeeded += 1
+            else:
+                failed += 1
+            lines.append(encode({"line": line_number, **response}))
+        out.write("\n".join(lines) + "\n")
+        chunk.clear()
+
+    for item in commands:
+        chunk.append(item)
+        if len(chunk) >= chunk_lines:
+            write_chunk()
+    if chunk:
+        write_chunk()
+    return succeeded, failed
+
+def run_batch_file(path, fmt="jsonl", output="-", respond_many=None):
+    in_stream = sys.stdin if path == "-" else open(path, encoding="utf-8", newline="")
+    out_stream = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+    try:
+        succeeded, failed = run_commands(read_commands(in_stream, fmt), out_stream, respond_many=respond_many)
+    finally:
+        if in_stream is not sys.stdin:
+            in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+    print(f"{succeeded} commands succeeded, {failed} failed.", file=sys.stderr)
+    return failed
+
+def serve_commands(address, respond=command_response, respond_many=None):
+    """
+    Serves the batch commands over TCP on 'address' ("host:port", port 0
+    picks a free one): one JSON command per line in, one result per line out.
+    'respond' answers one command here, on the event loop; 'respond_many'
+    (e.g. a ShardedOwnerStore's) instead answers the commands waiting across
+    all connections as one batch, off the event loop.
+    """
+    from pokedex_server import run_server
+
+    host, _, port = address.rpartition(":")
+    try:
+        port = int(port)
+    except ValueError:
+        print(f"Invalid address {address!r}, expected host:port.", file=sys.stderr)
+        return 2
+
+    def ready(bound):
+        print(f"Listening on {bound[0]}:{bound[1]}", file=sys.stderr, flush=True)
+
+    get_catalog()  # Load before the first client rather than during its request
+    run_server(respond, host or "127.0.0.1", port, ready, respond_many)
+    return 0
+
 ########################
-# 8) Sub-menu & Main menu
+# 11) Instrumentation
+########################
+
+# Call counts and timings for the hot paths, off unless enable_metrics() is
+# called (--metrics). The functions are swapped for timed wrappers only while
+# enabled, so there is no cost at all otherwise.
+ownerMetrics = None
+
+def metric_targets():
+    module = sys.modules[__name__]
+    return [
+        ("tree", module, ("insert_owner_bst", "find_owner_bst", "delete_owner_bst",
+                          "build_balanced_owner_tree", "owners_with_prefix", "bfs_owners",
+                          "pre_order_owners", "in_order_owners", "post_order_owners")),
+        ("catalog", module, ("get_poke_dict_by_id", "get_poke_dict_by_name", "get_pokes_by_type",
+                             "matching_species_ids", "filter_pokedex")),
+        ("store", OwnerStore, ("find", "insert_owner", "remove_owner", "add_species", "remove_species",
+                               "top_owners", "ranked_owners", "owners_with", "strongest", "stat_range",
+                               "statistics", "bulk_insert")),
+        ("pokedex", module, ("evolve_species_for_owner", "evolve_all_for_owner", "apply_command")),
+        ("render", module, ("print_owners", "display_pokemon_list", "sort_owners_by_num_pokemon",
+                            "write_owners", "write_pokemon_list", "write_ranking")),
+    ]
+
+def enable_metrics():
+    global ownerMetrics
+    if ownerMetrics is None:
+        ownerMetrics = Metrics()
+        for group, owner, names in metric_targets():
+            ownerMetrics.instrument(owner, names, group)
+    return ownerMetrics
+
+def disable_metrics():
+    global ownerMetrics
+    if ownerMetrics is not None:
+        ownerMetrics.uninstrument()
+        ownerMetrics = None
+
+def tree_health(root=None):
+    """
+    Shape of the owner tree (the default store's unless 'root' is given):
+    node count, stored and measured height, the smallest height possible for
+    that many nodes, average lookup path length (node depth), balance factor
+    counts and nodes whose stored height is stale. Walks every node.
+    """
+    with ownerStore.lock.read():
+        if root is None:
+            root = ownerStore.root
+        nodes = depth_total = max_depth = stale = 0
+        balance = {}
+        stack = [(root, 1)] if root is not None else []
+        while stack:
+            node, depth = stack.pop()
+            nodes += 1
+            depth_total += depth
+            max_depth = max(max_depth, depth)
+            left, right = node_height(node["left"]), node_height(node["right"])
+            if node["height"] != 1 + max(left, right):
+                stale += 1
+            balance[left - right] = balance.get(left - right, 0) + 1
+            for child in (node["left"], node["right"]):
+                if child is not None:
+                    stack.append((child, depth + 1))
+
+    return {
+        "nodes": nodes,
+        "height": node_height(root),
+        "measured_height": max_depth,
+        "min_height": nodes.bit_length(),
+        "average_depth": depth_total / nodes if nodes else 0.0,
+        "root_balance": node_height(root["left"]) - node_height(root["right"]) if root is not None else 0,
+        "balance_factors": {str(factor): count for factor, count in sorted(balance.items())},
+        "stale_heights": stale,
+    }
+
+def print_tree_health(stream=None):
+    stream = stream if stream is not None else sys.stdout
+    health = tree_health()
+    stream.write(f"Owner tree: {health['nodes']:,} nodes, height {health['height']} "
+                 f"(measured {health['measured_height']}, minimum {health['min_height']}), "
+                 f"average depth {health['average_depth']:.2f}\n")
+    stream.write(f"Balance factors: {health['balance_factors']}, root {health['root_balance']}, "
+                 f"stale heights {health['stale_heights']}\n")
+
+########################
+# 12) Sub-menu & Main menu
 ########################
 def format_owner_name(name):
     return " ".join([word.capitalize() for word in name.split()])
@@ -513,16 +1829,17 @@ def pokedex_menu(owner_node):
             print("Invalid choice.")
 
 def existing_pokedex():
-    global ownerRoot
-
     # Get owner name
     owner_name = input("Owner name: ").strip().lower()
 
     # Search for the owner in BST
-    owner_node = find_owner_bst(ownerRoot, owner_name)
+    owner_node = ownerStore.find(owner_name)
 
     if owner_node is None:
         print(f"Owner '{owner_name}' not found.")
+        suggestions = complete_owner_names(owner_name, 5)
+        if suggestions:
+            print(f"Owners starting with '{owner_name}': {', '.join(suggestions)}")
         return
 
     # Owner found - Show Pokedex menu
@@ -559,8 +1876,81 @@ def main_menu():
             print("Goodbye!")
             break  # Exit the loop and end the program
 
-def main():
-    main_menu()
+def run_sharded(args):
+    from pokedex_shards import ShardedOwnerStore
+
+    with ShardedOwnerStore(args.shards, catalogPath, args.db) as store:
+        if args.batch:
+            return 1 if run_batch_file(args.batch, args.format, args.output, store.respond_many) else 0
+        return serve_commands(args.serve, respond_many=store.respond_many)
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Hoenn Pokedex manager")
+    parser.add_argument("--db", metavar="PATH",
+                        help="load owners from this SQLite file and save every change to it")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="apply the commands in FILE ('-' for stdin) instead of showing the menu")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl",
+                        help="format of the --batch input and the --import/--export dumps (default: jsonl)")
+    parser.add_argument("--output", metavar="FILE", default="-",
+                        help="where --batch writes its JSONL results (default: stdout)")
+    parser.add_argument("--serve", metavar="HOST:PORT",
+                        help="serve the batch commands as JSON lines over TCP instead of showing the menu")
+    parser.add_argument("--import", dest="import_path", metavar="FILE",
+                        help="add the owners dumped in FILE ('-' for stdin) in one bulk insert")
+    parser.add_argument("--export", metavar="FILE",
+                        help="dump every owner to FILE ('-' for stdout) before exiting")
+    parser.add_argument("--render", choices=("text", "json", "csv"), default="text",
+                        help="format of the Pokedex and owner listings (default: text)")
+    parser.add_argument("--shards", type=int, metavar="N",
+                        help="with --batch or --serve: spread owners over N worker processes "
+                             "(with --db, each shard uses its own PATH.<i>-of-<N> file)")
+    parser.add_argument("--metrics", action="store_true",
+                        help="time the hot paths and print them with the tree health on exit (stderr)")
+    parser.add_argument("--profile", choices=("cpu", "memory"),
+                        help="run under cProfile or tracemalloc and print a report on exit (stderr)")
+    parser.add_argument("--profile-out", metavar="FILE",
+                        help="also save the raw --profile data (pstats file or tracemalloc snapshot)")
+    args = parser.parse_args(argv)
+    if args.shards is not None and (args.shards < 1 or not (args.batch or args.serve)):
+        parser.error("--shards needs a positive count and --batch or --serve")
+    if args.shards is not None and (args.import_path or args.export):
+        parser.error("--import and --export do not support --shards")
+
+    global renderFormat
+    renderFormat = args.render
+    if args.metrics:
+        enable_metrics()
+    profiler = Profiler(args.profile) if args.profile else None
+    try:
+        if args.shards:
+            return run_sharded(args)
+        if args.db:
+            load_owners_from_db(args.db)
+        if args.import_path:
+            try:
+                import_owners_file(args.import_path, args.format)
+            except ValueError as e:
+                print(f"Cannot import {args.import_path}: {e}", file=sys.stderr)
+                return 2
+        status = 0
+        if args.batch:
+            status = 1 if run_batch_file(args.batch, args.format, args.output) else 0
+        elif args.serve:
+            status = serve_commands(args.serve)
+        elif not (args.import_path or args.export):
+            main_menu()
+        if args.export:
+            export_owners_file(args.export, args.format)
+        return status
+    finally:
+        if profiler is not None:
+            profiler.report(sys.stderr, args.profile_out)
+        if ownerMetrics is not None:
+            ownerMetrics.report(sys.stderr)
+            print_tree_health(sys.stderr)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
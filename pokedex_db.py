@@ -0,0 +1,90 @@
+# pokedex_db.py
+
+import sys
+from array import array
+
+# Each owner is one row; the Pokedex is stored as a compact blob of
+# little-endian uint32 species IDs in insertion order, so loading is a single table scan.
+# 'starter' is the species the owner started with (NULL if unknown).
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS owners (
+    owner_lower    TEXT PRIMARY KEY,
+    owner_original TEXT NOT NULL,
+    pokedex        BLOB NOT NULL,
+    starter        INTEGER
+) WITHOUT ROWID;
+"""
+
+
+def open_db(path):
+    """
+    Opens (or creates) the owner database at 'path'. Every write below is
+    a small autocommitted statement touching one owner row, so changes are
+    applied incrementally and the file is never rewritten as a whole.
+    """
+    import sqlite3  # Only needed when a database is used; keeps ex7 imports cheap
+
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    # Databases created before the starter column existed
+    if "starter" not in [row[1] for row in conn.execute("PRAGMA table_info(owners)")]:
+        conn.execute("ALTER TABLE owners ADD COLUMN starter INTEGER")
+    return conn
+
+
+# The same bytes on every machine: a 4-byte array type, swapped on big-endian hosts
+UINT32 = next(code for code in "IL" if array(code).itemsize == 4)
+SWAP_BYTES = sys.byteorder != "little"
+
+
+def pack_species_ids(species_ids):
+    ids = array(UINT32, species_ids)
+    if SWAP_BYTES:
+        ids.byteswap()
+    return ids.tobytes()
+
+
+def unpack_species_ids(blob):
+    ids = array(UINT32)
+    ids.frombytes(blob)
+    if SWAP_BYTES:
+        ids.byteswap()
+    return ids
+
+
+def db_insert_owner(conn, owner_lower, owner_original, species_ids, starter=None):
+    conn.execute("INSERT OR REPLACE INTO owners VALUES (?, ?, ?, ?)",
+                 (owner_lower, owner_original, pack_species_ids(species_ids), starter))
+
+
+def db_insert_owners(conn, rows):
+    """Inserts many (owner_lower, owner_original, species IDs, starter) rows in one transaction."""
+    conn.execute("BEGIN")
+    try:
+        conn.executemany("INSERT OR REPLACE INTO owners VALUES (?, ?, ?, ?)",
+                         ((owner_lower, owner_original, pack_species_ids(species_ids), starter)
+                          for owner_lower, owner_original, species_ids, starter in rows))
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def db_delete_owner(conn, owner_lower):
+    conn.execute("DELETE FROM owners WHERE owner_lower = ?", (owner_lower,))
+
+
+def db_save_pokedex(conn, owner_lower, species_ids):
+    conn.execute("UPDATE owners SET pokedex = ? WHERE owner_lower = ?",
+                 (pack_species_ids(species_ids), owner_lower))
+
+
+def db_load_owners(conn):
+    """
+    Returns [(owner_original, species IDs, starter)] for every owner, sorted
+    by lowercase owner name, from one ordered primary-key scan.
+    """
+    rows = conn.execute("SELECT owner_original, pokedex, starter FROM owners ORDER BY owner_lower").fetchall()
+    return [(owner_original, unpack_species_ids(blob), starter) for owner_original, blob, starter in rows]
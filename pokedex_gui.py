@@ -1,93 +1,288 @@
-# pokedex_gui.py
-
-import tkinter as tk
-from PIL import Image, ImageTk
-import os
-
-
-def show_Pokedex_GUI(pokeList):
-    """
-    Display each Pokemon in a simple Tkinter window with its Name, Type, HP,
-    Attack, and optionally an image from the 'pokemons' folder.
-    We allow horizontal resizing so each Pokemon 'frame' expands in width.
-    """
-    root = tk.Tk()
-    root.title("My Pokedex GUI")
-
-    # Create a canvas and a vertical scrollbar
-    canvas = tk.Canvas(root)
-    scrollbar = tk.Scrollbar(root, orient="vertical", command=canvas.yview)
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    # This 'scrollable_frame' is where we'll place each Pokemon frame.
-    scrollable_frame = tk.Frame(canvas)
-
-    # A callback to update the scrollregion whenever 'scrollable_frame' changes size
-    def on_frame_configure(event):
-        canvas.configure(scrollregion=canvas.bbox("all"))
-
-    scrollable_frame.bind("<Configure>", on_frame_configure)
-
-    # Actually place 'scrollable_frame' in the canvas
-    # We'll store the canvas window ID so we can update its width on resize
-    canvas_window = canvas.create_window(
-        (0, 0), window=scrollable_frame, anchor="nw")
-
-    # A callback to keep the scrollable_frame the same width as the canvas
-    def on_canvas_configure(event):
-        # Set the scrollable_frame width to match canvas' width
-        canvas.itemconfig(canvas_window, width=event.width)
-
-    canvas.bind("<Configure>", on_canvas_configure)
-
-    # Mouse wheel handling
-    def on_mouse_wheel(event):
-        # On Windows/macOS: event.delta is typically ±120 per wheel step
-        canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-
-    canvas.bind_all("<MouseWheel>", on_mouse_wheel)  # Windows/macOS
-    # For Linux (buttons 4=up, 5=down):
-    canvas.bind_all("<Button-4>", lambda e: canvas.yview_scroll(-1, "units"))
-    canvas.bind_all("<Button-5>", lambda e: canvas.yview_scroll(1, "units"))
-
-    # Pack the canvas and scrollbar
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
-
-    if not pokeList:
-        msg = tk.Label(scrollable_frame, text="No Pokemon in this Pokedex!")
-        msg.pack(padx=10, pady=10)
-    else:
-        for poke in pokeList:
-            # Create a frame for each Pokémon, fill horizontally, expand so it can grow
-            frame = tk.Frame(scrollable_frame, bd=2,
-                             relief='groove', padx=5, pady=5)
-            frame.pack(side="top", fill="x", expand=True, padx=10, pady=5)
-
-            # Pokemon text info
-            info = (
-                f"ID: {poke['ID']} | "
-                f"Name: {poke['Name']} | "
-                f"Type: {poke['Type']} | "
-                f"HP: {poke['HP']} | "
-                f"Attack: {poke['Attack']} | "
-                f"Can Evolve: {poke['Can Evolve']}"
-            )
-            # The text label also fills horizontally and expands
-            label = tk.Label(frame, text=info, anchor="w")
-            label.pack(side="left", fill="x", expand=True)
-
-            image_path = os.path.join("pokemons", f"{poke['ID'] + 251}.png")
-            if os.path.exists(image_path):
-                try:
-                    img = Image.open(image_path)
-                    img = img.resize((80, 80), Image.ANTIALIAS)
-                    photo = ImageTk.PhotoImage(img)
-                    picLabel = tk.Label(frame, image=photo)
-                    picLabel.photo = photo  # keep reference
-                    picLabel.pack(side="right", padx=5)
-                except Exception as e:
-                    print(f"Error loading image {image_path}: {e}")
-                    # If error, we'll ignore and just not show the image
-
-    root.mainloop()
+# pokedex_gui.py
+
+import tkinter as tk
+from PIL import Image, ImageTk
+import os
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from species_catalog import write_snapshot
+
+SPRITE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pokemons")
+THUMB_SIZE = (80, 80)
+THUMB_CACHE_PATH = os.path.join(SPRITE_DIR, "thumbnails-80x80.snapshot")
+THUMB_CACHE_VERSION = 1
+DECODE_WORKERS = min(8, (os.cpu_count() or 1) + 1)
+POLL_MS = 30  # How often the UI thread picks up finished thumbnails
+ROW_HEIGHT = 100  # Pixels per list row: the thumbnail plus padding and border
+OVERSCAN = 4  # Rows kept ready above and below the visible ones
+
+
+def sprite_path(poke):
+    return os.path.join(SPRITE_DIR, f"{poke['ID'] + 251}.png")
+
+
+def render_thumbnail(path):
+    """Decodes a sprite and shrinks it to THUMB_SIZE; returns raw RGBA bytes."""
+    with Image.open(path) as img:
+        return img.convert("RGBA").resize(THUMB_SIZE, Image.LANCZOS).tobytes()
+
+
+class ThumbnailCache:
+    """
+    Pre-rendered thumbnails of the sprites, all kept in one snapshot file
+    as {sprite file name: (mtime_ns, size, RGBA bytes)}. A thumbnail is only
+    rendered again when its sprite's mtime or size changes. get() is safe to
+    call from worker threads.
+    """
+
+    def __init__(self, path=THUMB_CACHE_PATH):
+        self.path = path
+        self.entries = self.read(path)
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def read(path):
+        try:
+            with open(path, "rb") as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return {}
+        if (not isinstance(snapshot, dict) or snapshot.get("version") != THUMB_CACHE_VERSION
+                or snapshot.get("size") != THUMB_SIZE):
+            return {}
+        return snapshot["entries"]
+
+    def get(self, sprite):
+        """Returns the thumbnail for the sprite file as a PIL image, or None if it is missing."""
+        try:
+            st = os.stat(sprite)
+        except OSError:
+            return None
+        key = os.path.basename(sprite)
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+            entry = (st.st_mtime_ns, st.st_size, render_thumbnail(sprite))
+            with self.lock:
+                self.entries[key] = entry
+                self.dirty = True
+        return Image.frombytes("RGBA", THUMB_SIZE, entry[2])
+
+    def save(self):
+        with self.lock:
+            if not self.dirty:
+                return
+            entries = dict(self.entries)
+            self.dirty = False
+        write_snapshot(self.path, {"version": THUMB_CACHE_VERSION, "size": THUMB_SIZE, "entries": entries})
+
+
+thumbnailCache = None
+
+
+def get_thumbnail_cache():
+    global thumbnailCache
+    if thumbnailCache is None:
+        thumbnailCache = ThumbnailCache()
+    return thumbnailCache
+
+
+def load_thumbnail(cache, sprite):
+    try:
+        return cache.get(sprite)
+    except Exception as e:
+        print(f"Error loading image {sprite}: {e}")
+        # If error, we'll ignore and just not show the image
+        return None
+
+
+def pokemon_info(poke):
+    return (
+        f"ID: {poke['ID']} | "
+        f"Name: {poke['Name']} | "
+        f"Type: {poke['Type']} | "
+        f"HP: {poke['HP']} | "
+        f"Attack: {poke['Attack']} | "
+        f"Can Evolve: {poke['Can Evolve']}"
+    )
+
+
+def pokedex_rows(pokeList):
+    """List rows for one Pokedex: ("pokemon", poke) or a ("message", text) placeholder."""
+    if not pokeList:
+        return [("message", "No Pokemon in this Pokedex!")]
+    return [("pokemon", poke) for poke in pokeList]
+
+
+def owner_rows(owner_nodes):
+    """List rows for many owners: an ("owner", text) header followed by each Pokedex."""
+    rows = []
+    for node in owner_nodes:
+        rows.append(("owner", f"Owner: {node['owner_original']}"))
+        rows.extend(pokedex_rows(list(node["pokedex"].values())))
+    return rows
+
+
+def visible_range(top, height, count, row_height=ROW_HEIGHT, overscan=OVERSCAN):
+    """Returns the [first, last) row indexes to lay out for a view of 'height' pixels at 'top'."""
+    first = max(0, int(top // row_height) - overscan)
+    last = min(count, int((top + height) // row_height) + 1 + overscan)
+    return first, max(first, last)
+
+
+class VirtualList:
+    """
+    A scrolling list that only has widgets for the rows on screen (plus
+    OVERSCAN on each side). Row i is drawn by slot i % len(slots), so when the
+    view moves only the rows scrolling into view are rebound; the widget
+    count depends on the window height, not on len(rows). Thumbnails are
+    requested as rows become visible and shared between rows per sprite.
+    """
+
+    def __init__(self, root, rows):
+        self.root = root
+        self.rows = rows
+        self.slots = []
+
+        self.canvas = tk.Canvas(root, yscrollincrement=ROW_HEIGHT // 4, highlightthickness=0)
+        self.scrollbar = tk.Scrollbar(root, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self.on_scroll,
+                              scrollregion=(0, 0, 1, len(rows) * ROW_HEIGHT))
+        self.canvas.bind("<Configure>", self.on_configure)
+
+        # Mouse wheel handling
+        def on_mouse_wheel(event):
+            # On Windows/macOS: event.delta is typically ±120 per wheel step
+            self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+
+        self.canvas.bind_all("<MouseWheel>", on_mouse_wheel)  # Windows/macOS
+        # For Linux (buttons 4=up, 5=down):
+        self.canvas.bind_all("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        self.canvas.bind_all("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        # Sprite path -> shared PhotoImage (None if it failed to load)
+        self.photos = {}
+        self.blank = tk.PhotoImage(width=THUMB_SIZE[0], height=THUMB_SIZE[1])
+        self.cache = get_thumbnail_cache()
+        self.executor = ThreadPoolExecutor(max_workers=DECODE_WORKERS)
+        self.pending = {}
+        self.requested = set()
+
+    def on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.refresh()
+
+    def on_configure(self, event):
+        for slot in self.slots:
+            self.canvas.itemconfigure(slot["item"], width=event.width)
+        self.refresh()
+
+    def new_slot(self):
+        frame = tk.Frame(self.canvas, bd=2, relief="groove", padx=5, pady=5)
+        info = tk.Label(frame, anchor="w")
+        info.pack(side="left", fill="x", expand=True)
+        pic = tk.Label(frame)
+        pic.pack(side="right", padx=5)
+        item = self.canvas.create_window(0, 0, window=frame, anchor="nw", state="hidden",
+                                         width=self.canvas.winfo_width(), height=ROW_HEIGHT - 6)
+        return {"item": item, "frame": frame, "info": info, "pic": pic, "index": None, "sprite": None}
+
+    def refresh(self):
+        top = self.canvas.canvasy(0)
+        first, last = visible_range(top, self.canvas.winfo_height(), len(self.rows))
+
+        if last - first > len(self.slots):
+            while len(self.slots) < last - first:
+                self.slots.append(self.new_slot())
+            # The ring size changed, so every row maps to a new slot
+            for slot in self.slots:
+                if slot["index"] is not None:
+                    slot["index"] = -1  # Still placed, but must be rebound or hidden
+
+        nslots = len(self.slots)
+        shown = set()
+        for index in range(first, last):
+            slot = self.slots[index % nslots]
+            shown.add(id(slot))
+            if slot["index"] != index:
+                self.bind_row(slot, index)
+        for slot in self.slots:
+            if id(slot) not in shown and slot["index"] is not None:
+                self.canvas.itemconfigure(slot["item"], state="hidden")
+                slot["index"] = None
+
+    def bind_row(self, slot, index):
+        kind, value = self.rows[index]
+        if kind == "pokemon":
+            slot["info"].configure(text=pokemon_info(value), font="TkDefaultFont")
+            slot["frame"].configure(relief="groove")
+            sprite = sprite_path(value)
+            slot["sprite"] = sprite
+            slot["pic"].configure(image=self.photo_for(sprite) or "")
+        else:
+            slot["info"].configure(text=value, font="TkHeadingFont" if kind == "owner" else "TkDefaultFont")
+            slot["frame"].configure(relief="flat")
+            slot["sprite"] = None
+            slot["pic"].configure(image="")
+        self.canvas.coords(slot["item"], 0, index * ROW_HEIGHT)
+        self.canvas.itemconfigure(slot["item"], state="normal")
+        slot["index"] = index
+
+    def photo_for(self, sprite):
+        """Returns the sprite's PhotoImage, the blank placeholder while it loads, or None."""
+        if sprite in self.photos:
+            return self.photos[sprite]
+        if sprite not in self.requested:
+            self.requested.add(sprite)
+            if not self.pending:
+                self.root.after(POLL_MS, self.poll_thumbnails)
+            self.pending[self.executor.submit(load_thumbnail, self.cache, sprite)] = sprite
+        return self.blank
+
+    def poll_thumbnails(self):
+        done = {}
+        for future in [f for f in self.pending if f.done()]:
+            sprite = self.pending.pop(future)
+            img = future.result()
+            # PhotoImage must be created on the Tk thread; one per species
+            done[sprite] = self.photos[sprite] = ImageTk.PhotoImage(img) if img is not None else None
+        for slot in self.slots:
+            if slot["sprite"] in done:
+                slot["pic"].configure(image=done[slot["sprite"]] or "")
+        if self.pending:
+            self.root.after(POLL_MS, self.poll_thumbnails)
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.cache.save()
+
+
+def show_rows_GUI(rows, title):
+    root = tk.Tk()
+    root.title(title)
+    view = VirtualList(root, rows)
+    try:
+        root.mainloop()
+    finally:
+        view.close()
+
+
+def show_Pokedex_GUI(pokeList):
+    """
+    Display each Pokemon in a simple Tkinter window with its Name, Type, HP,
+    Attack, and optionally an image from the 'pokemons' folder.
+    Rows stretch with the window width; only the rows on screen exist as
+    widgets, and images are decoded on a thread pool (or read from the
+    thumbnail cache) as rows scroll into view.
+    """
+    show_rows_GUI(pokedex_rows(pokeList), "My Pokedex GUI")
+
+
+def show_owners_GUI(owner_nodes):
+    """Like show_Pokedex_GUI, for every owner in turn: a header row, then their Pokedex."""
+    show_rows_GUI(owner_rows(owner_nodes), "All Pokedexes")
@@ -0,0 +1,219 @@
+# pokedex_index.py
+
+from bisect import bisect_left, bisect_right
+from functools import reduce
+from itertools import chain, islice
+from operator import and_, itemgetter, or_
+
+from sorted_blocks import SortedBlockList
+from species_catalog import optional_numpy
+
+
+class SpeciesOwnerIndex:
+    """
+    Reverse index from species to the owners holding it. Every registered
+    owner gets a small integer slot (node["slot"]); each species has a
+    bitset (bytearray, bit 'slot' set if that owner holds it). Freed slots
+    are reused so the bitsets stay as short as the owner count allows.
+    All/any queries AND/OR whole bitsets at C speed instead of walking owners.
+    """
+
+    def __init__(self):
+        self.bitsets = {}  # Species ID -> bytearray
+        self.slot_owners = []  # Slot -> owner node, None if free
+        self.free_slots = []
+
+    def add_owner(self, owner_node):
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.slot_owners[slot] = owner_node
+        else:
+            slot = len(self.slot_owners)
+            self.slot_owners.append(owner_node)
+        owner_node["slot"] = slot
+        for species_id in owner_node["pokedex"]:
+            self.add(owner_node, species_id)
+
+    def remove_owner(self, owner_node):
+        for species_id in owner_node["pokedex"]:
+            self.remove(owner_node, species_id)
+        slot = owner_node["slot"]
+        self.slot_owners[slot] = None
+        self.free_slots.append(slot)
+        owner_node["slot"] = None
+
+    def add(self, owner_node, species_id):
+        slot = owner_node["slot"]
+        bits = self.bitsets.get(species_id)
+        if bits is None:
+            bits = self.bitsets[species_id] = bytearray()
+        if len(bits) <= slot >> 3:
+            bits.extend(bytes((slot >> 3) + 1 - len(bits)))
+        bits[slot >> 3] |= 1 << (slot & 7)
+
+    def remove(self, owner_node, species_id):
+        slot = owner_node["slot"]
+        bits = self.bitsets.get(species_id)
+        if bits is not None and len(bits) > slot >> 3:
+            bits[slot >> 3] &= ~(1 << (slot & 7)) & 0xFF
+
+    def match(self, all_of=(), any_of=()):
+        """
+        Bitset (as an int) of the owners holding every species in 'all_of'
+        and at least one in 'any_of'. An empty 'all_of' places no condition,
+        an empty 'any_of' likewise; both empty matches nobody.
+        """
+        if not all_of and not any_of:
+            return 0
+        parts = []
+        if all_of:
+            sets = [self.bitsets.get(species_id) for species_id in all_of]
+            if any(bits is None for bits in sets):
+                return 0
+            parts.append(reduce(and_, (int.from_bytes(bits, "little") for bits in sets)))
+        if any_of:
+            parts.append(reduce(or_, (int.from_bytes(self.bitsets.get(species_id, b""), "little")
+                                      for species_id in any_of)))
+        return reduce(and_, parts)
+
+    def owners(self, mask, limit=None):
+        """The owner nodes whose bits are set in 'mask', in slot order."""
+        if not mask:
+            return []
+        data = mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+        np = optional_numpy()
+        if np is not None:
+            slots = np.flatnonzero(np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder="little"))
+            if limit is not None:
+                slots = slots[:limit]
+            return [self.slot_owners[slot] for slot in slots.tolist()]
+
+        result = []
+        for byte_index, byte in enumerate(data):
+            if not byte:
+                continue
+            for bit in range(8):
+                if byte & (1 << bit):
+                    result.append(self.slot_owners[(byte_index << 3) | bit])
+                    if limit is not None and len(result) >= limit:
+                        return result
+        return result
+
+    @classmethod
+    def build(cls, owner_nodes):
+        """Indexes 'owner_nodes' from scratch, giving them slots 0..n-1."""
+        index = cls()
+        index.slot_owners = list(owner_nodes)
+        for slot, owner_node in enumerate(index.slot_owners):
+            owner_node["slot"] = slot
+
+        np = optional_numpy()
+        if np is None:
+            for owner_node in index.slot_owners:
+                for species_id in owner_node["pokedex"]:
+                    index.add(owner_node, species_id)
+            return index
+
+        # One (species, slot) pair per owned Pokemon, grouped by species
+        pokedexes = list(map(itemgetter("pokedex"), index.slot_owners))
+        sizes = np.fromiter(map(len, pokedexes), dtype=np.int64, count=len(pokedexes))
+        species = np.fromiter(chain.from_iterable(pokedexes), dtype=np.int64, count=int(sizes.sum()))
+        slots = np.repeat(np.arange(len(pokedexes), dtype=np.int64), sizes)
+        order = np.argsort(species)
+        species, slots = species[order], slots[order]
+        starts = np.flatnonzero(np.r_[True, species[1:] != species[:-1]]) if species.size else []
+        ends = list(starts[1:]) + [species.size]
+        for start, end in zip(starts, ends):
+            group = slots[start:end]
+            held = np.zeros(int(group.max()) + 1, dtype=bool)
+            held[group] = True
+            index.bitsets[int(species[start])] = bytearray(np.packbits(held, bitorder="little").tobytes())
+        return index
+
+
+owner_key = itemgetter("owner_lower")
+
+
+class StatIndex:
+    """
+    Owned Pokemon ordered by a species stat (HP, Attack) across every owner.
+    Stats belong to species, so it keeps each species' holders sorted by
+    owner name and walks the species in stat order (SpeciesCatalog.stat_orders):
+    a top-k or range query costs O(log S + k) for S species, plus skipping
+    species nobody holds. The holders are SortedBlockLists, so adding or
+    releasing a Pokemon stays cheap even for species most owners hold.
+    Results are (owner node, Species) pairs.
+    """
+
+    def __init__(self):
+        self.holders = {}  # Species ID -> SortedBlockList of owner nodes by "owner_lower"
+
+    def add_owner(self, owner_node):
+        for species_id in owner_node["pokedex"]:
+            self.add(owner_node, species_id)
+
+    def remove_owner(self, owner_node):
+        for species_id in owner_node["pokedex"]:
+            self.remove(owner_node, species_id)
+
+    def add(self, owner_node, species_id):
+        nodes = self.holders.get(species_id)
+        if nodes is None:
+            nodes = self.holders[species_id] = SortedBlockList(key=owner_key)
+        nodes.add(owner_node)
+
+    def remove(self, owner_node, species_id):
+        nodes = self.holders.get(species_id)
+        if nodes is not None:
+            nodes.remove(owner_node["owner_lower"], lambda node: node is owner_node)
+
+    def top(self, order, k):
+        """
+        The k highest-stat pairs, given 'order' = (ascending stat values, Species):
+        by stat descending, then species ID, then owner name.
+        """
+        values, species = order
+        result = []
+        end = len(species)
+        while end and len(result) < k:
+            start = bisect_left(values, values[end - 1], 0, end)  # Species tied on this stat
+            for poke in species[start:end]:
+                nodes = self.holders.get(poke.id, ())
+                result.extend((node, poke) for node in islice(nodes, k - len(result)))
+                if len(result) >= k:
+                    break
+            end = start
+        return result
+
+    def range(self, order, low=None, high=None, limit=None):
+        """
+        Pairs whose stat is within [low, high] (None = unbounded), by stat,
+        species ID, then owner name. Returns (number of matches, up to
+        'limit' pairs).
+        """
+        values, species = order
+        start = 0 if low is None else bisect_left(values, low)
+        end = len(species) if high is None else bisect_right(values, high)
+        count = 0
+        result = []
+        for poke in species[start:end]:
+            nodes = self.holders.get(poke.id, ())
+            count += len(nodes)
+            room = len(nodes) if limit is None else limit - len(result)
+            result.extend((node, poke) for node in islice(nodes, room))
+        return count, result
+
+    @classmethod
+    def build(cls, sorted_nodes):
+        """Indexes owner nodes already sorted by name, appending in order (no searches)."""
+        index = cls()
+        holders = index.holders
+        for owner_node in sorted_nodes:
+            for species_id in owner_node["pokedex"]:
+                nodes = holders.get(species_id)
+                if nodes is None:
+                    nodes = holders[species_id] = []
+                nodes.append(owner_node)
+        for species_id, nodes in holders.items():
+            holders[species_id] = SortedBlockList(nodes, key=owner_key)
+        return index
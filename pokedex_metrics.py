@@ -0,0 +1,122 @@
+# pokedex_metrics.py
+
+import functools
+import sys
+import time
+from collections import Counter, defaultdict
+
+
+class Metrics:
+    """
+    Call counters and cumulative timers for instrumented functions. Nothing
+    is measured until instrument() swaps a function for its timed wrapper,
+    and uninstrument() puts the originals back, so disabled metrics cost
+    nothing. Counts are approximate when several threads update them at once.
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+        self.seconds = defaultdict(float)
+        self.installed = []  # (owner, attribute name, original)
+
+    def wrap(self, name, func):
+        import inspect  # Only needed once metrics are enabled; keeps ex7 imports cheap
+
+        calls = self.calls
+        seconds = self.seconds
+        clock = time.perf_counter
+
+        if inspect.isgeneratorfunction(func):
+            # Iteration time would include the consumer's work; count only
+            @functools.wraps(func)
+            def counted(*args, **kwargs):
+                calls[name] += 1
+                return func(*args, **kwargs)
+            return counted
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                calls[name] += 1
+                seconds[name] += clock() - start
+        return timed
+
+    def instrument(self, owner, names, group):
+        """Wraps owner.<name> (a module or a class) for each name, labelled 'group.name'."""
+        import inspect
+
+        for name in names:
+            original = inspect.getattr_static(owner, name)
+            setattr(owner, name, self.wrap(f"{group}.{name}", original))
+            self.installed.append((owner, name, original))
+
+    def uninstrument(self):
+        for owner, name, original in reversed(self.installed):
+            setattr(owner, name, original)
+        self.installed.clear()
+
+    def reset(self):
+        self.calls.clear()
+        self.seconds.clear()
+
+    def snapshot(self):
+        """{label: {"calls": n, "seconds": s}} for everything called so far."""
+        return {name: {"calls": count, "seconds": self.seconds.get(name, 0.0)}
+                for name, count in sorted(self.calls.items())}
+
+    def report(self, stream=None):
+        stream = stream if stream is not None else sys.stderr
+        rows = sorted(self.calls.items(), key=lambda item: (-self.seconds.get(item[0], 0.0), item[0]))
+        stream.write(f"{'function':<40} {'calls':>10} {'total ms':>10} {'avg us':>9}\n")
+        for name, count in rows:
+            total = self.seconds.get(name)
+            if total is None:
+                stream.write(f"{name:<40} {count:>10,} {'-':>10} {'-':>9}\n")
+            else:
+                stream.write(f"{name:<40} {count:>10,} {total * 1e3:>10.1f} {total / count * 1e6:>9.1f}\n")
+
+
+class Profiler:
+    """
+    Whole-run capture: "cpu" runs cProfile, "memory" runs tracemalloc.
+    report() prints the top entries and, given 'out_path', saves the raw
+    data (pstats file or tracemalloc snapshot) for later analysis.
+    """
+
+    TOP = 25
+
+    def __init__(self, kind):
+        self.kind = kind
+        if kind == "cpu":
+            import cProfile
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        elif kind == "memory":
+            import tracemalloc
+            tracemalloc.start(10)
+        else:
+            raise ValueError(f"unknown profile kind {kind!r}")
+
+    def report(self, stream=None, out_path=None):
+        stream = stream if stream is not None else sys.stderr
+        if self.kind == "cpu":
+            import pstats
+            self.profile.disable()
+            stats = pstats.Stats(self.profile, stream=stream)
+            stats.sort_stats("cumulative").print_stats(self.TOP)
+            if out_path:
+                stats.dump_stats(out_path)
+            return
+
+        import tracemalloc
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stream.write(f"Traced memory: {current / 1e6:.1f} MB now, {peak / 1e6:.1f} MB peak\n")
+        for stat in snapshot.statistics("lineno")[:self.TOP]:
+            stream.write(f"{stat}\n")
+        if out_path:
+            snapshot.dump(out_path)
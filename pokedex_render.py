@@ -0,0 +1,135 @@
+# pokedex_render.py
+
+import json
+import sys
+
+FORMATS = ("text", "json", "csv")
+
+NO_MATCH_MESSAGE = "There are no Pokemons in this Pokedex that match the criteria."
+
+CSV_POKEMON_HEADER = "ID,Name,Type,HP,Attack,Can Evolve"
+
+
+class LineWriter:
+    """
+    Collects output lines and writes them to 'stream' (stdout by default,
+    or any text file / io.StringIO) in large chunks, instead of one write
+    per line. Call flush() before handing the terminal back to input().
+    """
+
+    def __init__(self, stream=None, chunk_lines=4096):
+        self.stream = stream if stream is not None else sys.stdout
+        self.chunk_lines = chunk_lines
+        self.lines = []
+        self.csv_header = None  # Last CSV header written, to avoid repeats
+
+    def write(self, line):
+        self.lines.append(line)
+        if len(self.lines) >= self.chunk_lines:
+            self.flush()
+
+    def write_many(self, lines):
+        self.lines.extend(lines)
+        if len(self.lines) >= self.chunk_lines:
+            self.flush()
+
+    def write_csv_header(self, header):
+        if self.csv_header != header:
+            self.csv_header = header
+            self.write(header)
+
+    def flush(self):
+        if self.lines:
+            self.stream.write("\n".join(self.lines) + "\n")
+            self.lines.clear()
+
+
+def csv_field(value):
+    text = str(value)
+    if any(ch in text for ch in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+
+def text_pokemon(poke):
+    return (f"ID: {poke.id}, Name: {poke.name}, Type: {poke.type}, "
+            f"HP: {poke.hp}, Attack: {poke.attack}, Can Evolve: {poke['Can Evolve']}")
+
+
+def json_pokemon(poke):
+    return json.dumps({"ID": poke.id, "Name": poke.name, "Type": poke.type,
+                       "HP": poke.hp, "Attack": poke.attack, "Can Evolve": poke.can_evolve},
+                      ensure_ascii=False, separators=(",", ":"))
+
+
+def csv_pokemon(poke):
+    return ",".join((str(poke.id), csv_field(poke.name), csv_field(poke.type),
+                     str(poke.hp), str(poke.attack), poke["Can Evolve"]))
+
+
+POKEMON_FORMATTERS = {"text": text_pokemon, "json": json_pokemon, "csv": csv_pokemon}
+
+# Species records are immutable, so each one is formatted at most once per
+# format and the string reused for every owner holding it.
+POKEMON_LINE_CACHE = {fmt: {} for fmt in FORMATS}
+
+
+def pokemon_line(poke, fmt="text"):
+    cache = POKEMON_LINE_CACHE[fmt]
+    line = cache.get(poke)
+    if line is None:
+        line = cache[poke] = POKEMON_FORMATTERS[fmt](poke)
+    return line
+
+
+def write_pokemon_list(writer, poke_list, fmt="text"):
+    if fmt == "csv":
+        writer.write_csv_header(CSV_POKEMON_HEADER)
+    elif fmt == "text" and not poke_list:
+        writer.write(NO_MATCH_MESSAGE)
+        return
+
+    cache = POKEMON_LINE_CACHE[fmt]
+    writer.write_many(cache.get(poke) or pokemon_line(poke, fmt) for poke in poke_list)
+
+
+def write_owners(writer, owner_nodes, fmt="text", header_prefix=""):
+    """
+    Writes each owner and their Pokedex:
+      text : "Owner: <name>" then one line per Pokemon, as the menus print
+      json : one {"owner": ..., "pokedex": [...]} object per line
+      csv  : one "Owner,ID,Name,..." row per owned Pokemon
+    """
+    cache = POKEMON_LINE_CACHE[fmt]
+    if fmt == "csv":
+        writer.write_csv_header("Owner," + CSV_POKEMON_HEADER)
+
+    for node in owner_nodes:
+        pokedex = node["pokedex"].values()
+        lines = [cache.get(poke) or pokemon_line(poke, fmt) for poke in pokedex]
+
+        if fmt == "text":
+            writer.write(f"{header_prefix}Owner: {node['owner_original']}")
+            writer.write_many(lines if lines else [NO_MATCH_MESSAGE])
+        elif fmt == "json":
+            writer.write(f'{{"owner":{json.dumps(node["owner_original"], ensure_ascii=False)},'
+                         f'"pokedex":[{",".join(lines)}]}}')
+        else:
+            owner = csv_field(node["owner_original"]) + ","
+            writer.write_many(owner + line for line in lines)
+
+
+def write_ranking(writer, owner_nodes, fmt="text", title=None):
+    if fmt == "text":
+        if title:
+            writer.write(title)
+        writer.write_many(f"Owner: {node['owner_original']} (has {len(node['pokedex'])} Pokemon)\n"
+                          for node in owner_nodes)
+    elif fmt == "json":
+        writer.write_many(json.dumps({"owner": node["owner_original"], "count": len(node["pokedex"])},
+                                     ensure_ascii=False, separators=(",", ":"))
+                          for node in owner_nodes)
+    else:
+        writer.write_csv_header("Owner,Count")
+        writer.write_many(f"{csv_field(node['owner_original'])},{len(node['pokedex'])}"
+                          for node in owner_nodes)
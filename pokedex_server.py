@@ -0,0 +1,143 @@
+# pokedex_server.py
+
+import asyncio
+import json
+
+# Requests longer than this close the connection instead of growing the buffer
+MAX_LINE_BYTES = 64 * 1024
+
+# Stop reading a client's requests while this many response bytes are waiting
+# for it to read them (the client is pipelining faster than it consumes).
+WRITE_HIGH_WATER = 256 * 1024
+
+encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def decode_request(line):
+    """Returns the request object for one line, or None if it is not valid JSON."""
+    try:
+        return json.loads(line)
+    except (ValueError, RecursionError):  # RecursionError: absurdly deep nesting
+        return None
+
+
+def internal_error(exc):
+    return {"ok": False, "error": f"internal error: {type(exc).__name__}: {exc}"}
+
+
+class RequestBatcher:
+    """
+    Answers the requests of every connection with respond_many(requests),
+    one batch at a time on a worker thread: the event loop keeps serving
+    while a slow backend (a sharded store waiting on its processes) works,
+    and requests that arrive together are answered together.
+    """
+
+    def __init__(self, respond_many):
+        self.respond_many = respond_many
+        self.pending = []  # (request, future)
+        self.task = None
+
+    async def respond(self, request):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((request, future))
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while self.pending:
+                batch, self.pending = self.pending, []
+                try:
+                    responses = await loop.run_in_executor(
+                        None, self.respond_many, [request for request, _ in batch])
+                except Exception as e:
+                    responses = [internal_error(e)] * len(batch)
+                for (_, future), response in zip(batch, responses):
+                    if not future.cancelled():
+                        future.set_result(response)
+        finally:
+            self.task = None
+
+
+async def handle_client(reader, writer, respond):
+    """
+    Serves one connection: one JSON request per line in, one JSON response
+    per line out, in request order. Clients may pipeline any number of
+    requests; an "id" field in a request is echoed back in its response.
+    'respond' is a coroutine function mapping a request to its response.
+    """
+    writer.transport.set_write_buffer_limits(high=WRITE_HIGH_WATER)
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:  # Line longer than MAX_LINE_BYTES
+                writer.write(encode({"ok": False, "error": "request too long"}).encode() + b"\n")
+                break
+            if not line:
+                break
+            line = line.strip()
+            if not line:
+                continue
+
+            request = decode_request(line)
+            if request is None:
+                response = {"ok": False, "error": "invalid JSON"}
+            else:
+                try:
+                    response = await respond(request)
+                except Exception as e:  # One bad request must not cost the client its connection
+                    response = internal_error(e)
+                if isinstance(request, dict) and "id" in request:
+                    response = {"id": request["id"], **response}
+            try:
+                data = encode(response)
+            except Exception as e:
+                data = encode(internal_error(e))
+            writer.write(data.encode() + b"\n")
+
+            # Only waits once the client has fallen WRITE_HIGH_WATER behind;
+            # the next request is not read until it catches up.
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(respond, host="127.0.0.1", port=0, ready=None, respond_many=None):
+    """
+    Accepts clients on (host, port) until cancelled. 'respond' maps a request
+    object to a JSON-ready response dict; it runs on the event loop, so every
+    request sees the effects of the ones answered before it. Given
+    'respond_many' (a list of requests -> their responses) instead, requests
+    go through a RequestBatcher. 'ready' is called with the bound
+    (host, port) once the server is listening.
+    """
+    if respond_many is not None:
+        answer = RequestBatcher(respond_many).respond
+    else:
+        async def answer(request):
+            return respond(request)
+
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_client(reader, writer, answer),
+        host, port, limit=MAX_LINE_BYTES)
+    async with server:
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[:2])
+        await server.serve_forever()
+
+
+def run_server(respond, host="127.0.0.1", port=0, ready=None, respond_many=None):
+    try:
+        asyncio.run(serve(respond, host, port, ready, respond_many))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,278 @@
+# pokedex_shards.py
+
+import multiprocessing
+import zlib
+
+from pokedex_stats import OwnerAggregates, summarize
+
+# Commands that name one owner; they run on that owner's shard. The ones also
+# listed in SCATTER_OPS run on every shard when no owner is given.
+ROUTED_OPS = {"create", "add", "release", "evolve", "evolve_all", "delete", "find", "query"}
+SCATTER_OPS = {"evolve_all", "query", "ranking", "holders", "stats", "health", "strongest", "stat_range"}
+
+
+def shard_of(owner_name, shards):
+    """Stable across processes (unlike hash()), so an owner always maps to the same shard."""
+    return zlib.crc32(owner_name.strip().lower().encode("utf-8")) % shards
+
+
+class MergeError(Exception):
+    """The shards' results merge into an error, e.g. no shard holds the named owner."""
+
+
+def shard_db_path(path, index, shards):
+    return f"{path}.{index}-of-{shards}"
+
+
+########################
+# Worker side
+########################
+
+def shard_stats(ex7, command):
+    """Raw counters for one shard, so the coordinator can merge them exactly."""
+    top = ex7.command_count(command, "top")
+    aggregates = ex7.ownerStore.aggregates()
+    by_id = ex7.get_catalog().by_id
+    species_ids = set(aggregates["species_owners"]) | set(aggregates["starters"])
+    result = {"aggregates": aggregates, "top": 5 if top is None else top,
+              "names": {species_id: by_id[species_id].name for species_id in species_ids}}
+    if ex7.command_arg(command, "pokemon", required=False) is not None:
+        pokemon = ex7.command_species(command)
+        result["owners_holding"] = [pokemon.name, ex7.ownerStore.owners_holding(pokemon.id)]
+    if ex7.command_bool(command, "verify"):
+        result["consistent"] = ex7.ownerStore.verify_statistics()
+    if ex7.command_arg(command, "owner", required=False) is not None:
+        # Only the owner's own shard finds it; merge_stats fails if none does
+        owner_node = ex7.ownerStore.find(ex7.command_str(command, "owner").strip())
+        result["owner_averages"] = None if owner_node is None else ex7.owner_average_stats(owner_node)
+    return result
+
+
+def shard_response(ex7, command):
+    if not isinstance(command, dict) or command.get("op") != "shard_stats":
+        return ex7.command_response(command)
+    try:
+        return {"ok": True, "result": shard_stats(ex7, command)}
+    except ex7.CommandError as e:
+        return {"ok": False, "error": str(e)}
+    except Exception as e:  # As in command_response: fail the command, keep the shard
+        return {"ok": False, "error": f"internal error: {type(e).__name__}: {e}"}
+
+
+def shard_worker(conn, catalog_path, db_path):
+    """Runs in each worker process: answers batches of commands until sent None."""
+    import ex7
+
+    if catalog_path is not None:
+        ex7.set_catalog_path(catalog_path)
+    ex7.get_catalog()
+    if db_path is not None:
+        ex7.load_owners_from_db(db_path)
+    conn.send("ready")
+
+    while True:
+        batch = conn.recv()
+        if batch is None:
+            break
+        try:
+            responses = [shard_response(ex7, command) for command in batch]
+        except Exception as e:  # Only a bug in this loop; the coordinator still gets its reply
+            responses = [{"ok": False, "error": f"internal error: {type(e).__name__}: {e}"}] * len(batch)
+        conn.send(responses)
+    conn.close()
+
+
+########################
+# Coordinator side
+########################
+
+class ShardedOwnerStore:
+    """
+    Owners partitioned by hashed name over 'shards' worker processes, each
+    running its own ex7 owner store. Commands use the batch command format:
+    single-owner commands go to the owner's shard; ranking, statistics,
+    cross-owner queries and mass evolves run on every shard and the results
+    are merged. respond_many() sends the single-owner commands of a chunk to
+    the shards in one message each, so the shards work in parallel; a
+    cross-shard command waits for the commands before it to finish.
+    """
+
+    def __init__(self, shards, catalog_path=None, db_path=None):
+        context = multiprocessing.get_context("spawn")  # Fresh interpreters, no inherited state
+        self.conns = []
+        self.processes = []
+        for index in range(shards):
+            parent, child = context.Pipe()
+            process = context.Process(
+                target=shard_worker, daemon=True,
+                args=(child, catalog_path, shard_db_path(db_path, index, shards) if db_path else None))
+            process.start()
+            child.close()
+            self.conns.append(parent)
+            self.processes.append(process)
+        for conn in self.conns:
+            conn.recv()  # "ready"
+
+    def close(self):
+        for conn in self.conns:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join()
+        for conn in self.conns:
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def exchange(self, batches):
+        """Sends {shard: [commands]} and returns {shard: [responses]}, shards running in parallel."""
+        for index, batch in batches.items():
+            self.conns[index].send(batch)
+        return {index: self.conns[index].recv() for index in batches}
+
+    def target(self, command):
+        """The shard for a single-owner command, or None to run it on every shard."""
+        op = command.get("op")
+        if not isinstance(op, str):
+            return 0
+        owner = command.get("owner")
+        if op in ROUTED_OPS and owner not in (None, ""):
+            return shard_of(str(owner), len(self.conns))
+        if op in SCATTER_OPS:
+            return None
+        return 0  # Unknown op or missing owner: any shard gives the usual error
+
+    def respond(self, command):
+        return self.respond_many([command])[0]
+
+    def respond_many(self, commands):
+        """Responses ({"ok", "result"/"error"}) for 'commands', in order."""
+        responses = [None] * len(commands)
+        pending = {}  # Shard -> [(position, command)]
+
+        def flush():
+            if pending:
+                results = self.exchange({index: [command for _, command in items]
+                                         for index, items in pending.items()})
+                for index, items in pending.items():
+                    for (position, _), response in zip(items, results[index]):
+                        responses[position] = response
+                pending.clear()
+
+        for position, command in enumerate(commands):
+            if not isinstance(command, dict):
+                # CommandError from read_commands, or a JSON value that is not an object
+                responses[position] = {"ok": False, "error": str(command) if isinstance(command, Exception)
+                                       else "command must be an object"}
+                continue
+            index = self.target(command)
+            if index is not None:
+                pending.setdefault(index, []).append((position, command))
+            else:
+                flush()
+                responses[position] = self.scatter(command)
+        flush()
+        return responses
+
+    def scatter(self, command):
+        op = command["op"]
+        sent = dict(command, op="shard_stats") if op == "stats" else command
+        results = self.exchange({index: [sent] for index in range(len(self.conns))})
+        responses = [results[index][0] for index in range(len(self.conns))]
+        for response in responses:
+            if not response["ok"]:
+                return response
+        parts = [response["result"] for response in responses]
+        try:
+            return {"ok": True, "result": MERGERS[op](command, parts)}
+        except MergeError as e:
+            return {"ok": False, "error": str(e)}
+
+
+def merge_ranking(command, parts):
+    entries = [entry for part in parts for entry in part["ranking"]]
+    top = command.get("top")
+    if top in (None, ""):
+        entries.sort(key=lambda entry: (entry[1], entry[0].lower()))
+    else:
+        entries.sort(key=lambda entry: (-entry[1], entry[0].lower()))
+        entries = entries[:int(top)]
+    return {"ranking": entries}
+
+
+def merge_evolve_all(command, parts):
+    return {"evolved": sum(part["evolved"] for part in parts)}
+
+
+def merge_query(command, parts):
+    owners = [item for part in parts for item in part["owners"].items()]
+    owners.sort(key=lambda item: item[0].lower())
+    return {"owners": dict(owners)}
+
+
+def merge_holders(command, parts):
+    # Each shard sends its first 'limit' owners by name, so these include the overall first
+    owners = sorted((name for part in parts for name in part["owners"]), key=str.lower)
+    limit = command.get("limit")
+    if limit not in (None, ""):
+        owners = owners[:int(limit)]
+    return {"count": sum(part["count"] for part in parts), "owners": owners}
+
+
+def merge_stats(command, parts):
+    total = OwnerAggregates()
+    names = {}
+    for part in parts:
+        total.add_aggregates(OwnerAggregates.from_dict(part["aggregates"]))
+        names.update(part["names"])
+    result = summarize(total, names.__getitem__, parts[0]["top"])
+    if "owners_holding" in parts[0]:
+        result["owners_holding"] = [parts[0]["owners_holding"][0],
+                                    sum(part["owners_holding"][1] for part in parts)]
+    if "consistent" in parts[0]:
+        result["consistent"] = all(part["consistent"] for part in parts)
+    if "owner_averages" in parts[0]:
+        found = [part["owner_averages"] for part in parts if part["owner_averages"] is not None]
+        if not found:
+            raise MergeError(f"owner {str(command['owner']).strip()!r} not found")
+        result["owner_averages"] = found[0]
+    return result
+
+
+def merge_strongest(command, parts):
+    # Entries are [owner, Pokemon, ID, value]: highest value, then ID, then owner, as in one store
+    entries = [entry for part in parts for entry in part["pokemon"]]
+    entries.sort(key=lambda entry: (-entry[3], entry[2], entry[0].lower()))
+    top = command.get("top")
+    return {"pokemon": entries[:10 if top in (None, "") else int(top)]}
+
+
+def merge_stat_range(command, parts):
+    entries = [entry for part in parts for entry in part["pokemon"]]
+    entries.sort(key=lambda entry: (entry[3], entry[2], entry[0].lower()))
+    limit = command.get("limit")
+    if limit not in (None, ""):
+        entries = entries[:int(limit)]
+    return {"count": sum(part["count"] for part in parts), "pokemon": entries}
+
+
+def merge_health(command, parts):
+    return {"shards": parts}
+
+
+MERGERS = {
+    "ranking": merge_ranking,
+    "evolve_all": merge_evolve_all,
+    "query": merge_query,
+    "holders": merge_holders,
+    "stats": merge_stats,
+    "strongest": merge_strongest,
+    "stat_range": merge_stat_range,
+    "health": merge_health,
+}
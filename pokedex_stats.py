@@ -0,0 +1,189 @@
+# pokedex_stats.py
+
+from collections import Counter
+from heapq import nsmallest
+from itertools import chain
+from operator import itemgetter
+
+from species_catalog import optional_numpy
+
+
+class OwnerAggregates:
+    """
+    Fleet-wide counters over every registered owner, kept up to date one
+    change at a time (see OwnerStore) so queries never walk the owners:
+      owners, pokemon     : number of owners / owned Pokemon
+      species_owners      : species ID -> owners holding it (a Pokedex
+                            holds each species at most once)
+      type_counts         : type -> owned Pokemon of that type
+      hp_total, attack_total
+      starters            : species ID -> owners who started with it
+    """
+
+    def __init__(self):
+        self.owners = 0
+        self.pokemon = 0
+        self.species_owners = Counter()
+        self.type_counts = Counter()
+        self.hp_total = 0
+        self.attack_total = 0
+        self.starters = Counter()
+
+    def add_pokemon(self, poke):
+        self.pokemon += 1
+        self.species_owners[poke.id] += 1
+        self.type_counts[poke.type] += 1
+        self.hp_total += poke.hp
+        self.attack_total += poke.attack
+
+    def remove_pokemon(self, poke):
+        self.pokemon -= 1
+        decrement(self.species_owners, poke.id)
+        decrement(self.type_counts, poke.type)
+        self.hp_total -= poke.hp
+        self.attack_total -= poke.attack
+
+    def add_owner(self, owner_node):
+        self.owners += 1
+        if owner_node["starter"] is not None:
+            self.starters[owner_node["starter"]] += 1
+        for poke in owner_node["pokedex"].values():
+            self.add_pokemon(poke)
+
+    def remove_owner(self, owner_node):
+        self.owners -= 1
+        if owner_node["starter"] is not None:
+            decrement(self.starters, owner_node["starter"])
+        for poke in owner_node["pokedex"].values():
+            self.remove_pokemon(poke)
+
+    def owners_holding(self, species_id):
+        return self.species_owners.get(species_id, 0)
+
+    def most_held(self, k):
+        """The k species held by the most owners, as [(species ID, owners)]; ties by ID."""
+        return nsmallest(k, self.species_owners.items(), key=lambda item: (-item[1], item[0]))
+
+    def type_distribution(self):
+        return dict(sorted(self.type_counts.items()))
+
+    def average_pokedex_size(self):
+        return self.pokemon / self.owners if self.owners else 0.0
+
+    def average_hp(self):
+        return self.hp_total / self.pokemon if self.pokemon else 0.0
+
+    def average_attack(self):
+        return self.attack_total / self.pokemon if self.pokemon else 0.0
+
+    def most_common_starter(self):
+        """(species ID, owners) of the most chosen starter (ties by ID), or None."""
+        return min(self.starters.items(), key=lambda item: (-item[1], item[0]), default=None)
+
+    def add_aggregates(self, other):
+        """Adds in the counters of 'other' (e.g. another shard's owners)."""
+        self.owners += other.owners
+        self.pokemon += other.pokemon
+        self.species_owners.update(other.species_owners)
+        self.type_counts.update(other.type_counts)
+        self.hp_total += other.hp_total
+        self.attack_total += other.attack_total
+        self.starters.update(other.starters)
+
+    @classmethod
+    def from_dict(cls, values):
+        stats = cls()
+        stats.owners = values["owners"]
+        stats.pokemon = values["pokemon"]
+        stats.species_owners = Counter(values["species_owners"])
+        stats.type_counts = Counter(values["type_counts"])
+        stats.hp_total = values["hp_total"]
+        stats.attack_total = values["attack_total"]
+        stats.starters = Counter(values["starters"])
+        return stats
+
+    def as_dict(self):
+        return {
+            "owners": self.owners,
+            "pokemon": self.pokemon,
+            "species_owners": dict(self.species_owners),
+            "type_counts": dict(self.type_counts),
+            "hp_total": self.hp_total,
+            "attack_total": self.attack_total,
+            "starters": dict(self.starters),
+        }
+
+
+def decrement(counter, key):
+    # Drop keys that reach zero so the counters compare equal to a recompute
+    if counter[key] <= 1:
+        del counter[key]
+    else:
+        counter[key] -= 1
+
+
+def summarize(stats, species_name, top=5):
+    """JSON-ready summary of 'stats'; species_name maps a species ID to its name."""
+    starter = stats.most_common_starter()
+    return {
+        "owners": stats.owners,
+        "pokemon": stats.pokemon,
+        "average_pokedex_size": stats.average_pokedex_size(),
+        "average_hp": stats.average_hp(),
+        "average_attack": stats.average_attack(),
+        "types": stats.type_distribution(),
+        "most_common_starter": [species_name(starter[0]), starter[1]] if starter else None,
+        "most_held": [[species_name(species_id), owners] for species_id, owners in stats.most_held(top)],
+    }
+
+
+def owner_averages(owner_node):
+    """(average HP, average Attack) of one owner's Pokedex, in O(Pokedex size)."""
+    pokedex = owner_node["pokedex"].values()
+    if not pokedex:
+        return 0.0, 0.0
+    return (sum(poke.hp for poke in pokedex) / len(pokedex),
+            sum(poke.attack for poke in pokedex) / len(pokedex))
+
+
+def compute_aggregates(owner_nodes, data_list):
+    """
+    Builds OwnerAggregates from scratch by walking every owner; used to
+    verify the incremental counters. Uses NumPy (bincount over all owned
+    species IDs) when it is installed, else a plain Python pass.
+    """
+    owner_nodes = list(owner_nodes)
+    np = optional_numpy()
+    if np is None:
+        stats = OwnerAggregates()
+        for owner_node in owner_nodes:
+            stats.add_owner(owner_node)
+        return stats
+
+    size = max((poke.id for poke in data_list), default=0) + 1
+    type_names = sorted({poke.type for poke in data_list})
+    type_index = {name: code for code, name in enumerate(type_names)}
+    hp_by_id = np.zeros(size, dtype=np.int64)
+    attack_by_id = np.zeros(size, dtype=np.int64)
+    type_by_id = np.zeros(size, dtype=np.int64)
+    for poke in data_list:
+        hp_by_id[poke.id] = poke.hp
+        attack_by_id[poke.id] = poke.attack
+        type_by_id[poke.id] = type_index[poke.type]
+
+    owned = np.fromiter(chain.from_iterable(map(itemgetter("pokedex"), owner_nodes)), dtype=np.int64)
+    held = np.bincount(owned, minlength=size)
+    starter_ids = np.fromiter((owner_node["starter"] for owner_node in owner_nodes
+                               if owner_node["starter"] is not None), dtype=np.int64)
+    starters = np.bincount(starter_ids, minlength=size)
+    by_type = np.bincount(type_by_id, weights=held, minlength=len(type_names))
+
+    stats = OwnerAggregates()
+    stats.owners = len(owner_nodes)
+    stats.pokemon = int(owned.size)
+    stats.species_owners = Counter({int(i): int(held[i]) for i in np.flatnonzero(held)})
+    stats.starters = Counter({int(i): int(starters[i]) for i in np.flatnonzero(starters)})
+    stats.type_counts = Counter({type_names[i]: int(by_type[i]) for i in np.flatnonzero(by_type)})
+    stats.hp_total = int(held @ hp_by_id)
+    stats.attack_total = int(held @ attack_by_id)
+    return stats
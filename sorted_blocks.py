@@ -0,0 +1,94 @@
+# sorted_blocks.py
+
+from bisect import bisect_left, insort
+from itertools import chain, islice
+
+
+class SortedBlockList:
+    """
+    A sorted sequence stored as a list of blocks (plain sorted lists of at
+    most 2 * LOAD items) plus the key of the last item of every block.
+    add() and remove() bisect the block keys and then one block, so they
+    move O(LOAD) pointers instead of O(n) like insort/del on one flat list.
+    Items are ordered by key(item), or by the items themselves when 'key'
+    is None; keys should be unique so equal items never need comparing.
+    """
+
+    LOAD = 1000
+
+    def __init__(self, sorted_items=(), key=None):
+        """'sorted_items' must already be in order."""
+        self.key = key
+        items = list(sorted_items)
+        self.blocks = [items[i:i + self.LOAD] for i in range(0, len(items), self.LOAD)]
+        self.maxes = [self.key_of(block[-1]) for block in self.blocks]
+        self.size = len(items)
+
+    def key_of(self, item):
+        return item if self.key is None else self.key(item)
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return chain.from_iterable(self.blocks)
+
+    def __reversed__(self):
+        return chain.from_iterable(map(reversed, reversed(self.blocks)))
+
+    def add(self, item):
+        if not self.blocks:
+            self.blocks.append([item])
+            self.maxes.append(self.key_of(item))
+            self.size = 1
+            return
+        i = min(bisect_left(self.maxes, self.key_of(item)), len(self.blocks) - 1)
+        block = self.blocks[i]
+        insort(block, item, key=self.key)
+        self.maxes[i] = self.key_of(block[-1])
+        if len(block) > 2 * self.LOAD:
+            self.blocks[i:i + 1] = [block[:self.LOAD], block[self.LOAD:]]
+            self.maxes[i:i + 1] = [self.key_of(block[self.LOAD - 1]), self.maxes[i]]
+        self.size += 1
+
+    def locate(self, key):
+        """(block, offset) of the first item whose key is >= 'key'; (len(blocks), 0) if none."""
+        i = bisect_left(self.maxes, key)
+        if i == len(self.blocks):
+            return i, 0
+        return i, bisect_left(self.blocks[i], key, key=self.key)
+
+    def remove(self, key, match):
+        """
+        Removes the item with key 'key' if match(item) is true (e.g. an
+        identity check on the node it holds). Returns False if there is none.
+        """
+        i, j = self.locate(key)
+        if i == len(self.blocks):
+            return False
+        block = self.blocks[i]
+        if j >= len(block) or not match(block[j]):
+            return False
+        del block[j]
+        if block:
+            self.maxes[i] = self.key_of(block[-1])
+        else:
+            del self.blocks[i]
+            del self.maxes[i]
+        self.size -= 1
+        return True
+
+    def iter_from(self, i, j):
+        """Items in order from position (block i, offset j)."""
+        if i < len(self.blocks):
+            yield from islice(self.blocks[i], j, None)
+            yield from chain.from_iterable(islice(self.blocks, i + 1, None))
+
+    def before(self, i, j):
+        """The item just before position (block i, offset j), or None."""
+        if j:
+            return self.blocks[i][j - 1]
+        return self.blocks[i - 1][-1] if i else None
+
+    def last(self):
+        return self.blocks[-1][-1] if self.blocks else None
@@ -0,0 +1,408 @@
+# species_catalog.py
+
+import csv
+import hashlib
+import os
+import pickle
+from array import array
+from bisect import bisect_left
+from functools import cached_property
+
+CSV_HEADER = ["ID", "Name", "Type", "HP", "Attack", "Can Evolve"]
+
+# A species marked "Can Evolve" evolves into the next ID in the catalog,
+# except for these lines, which branch or evolve into species outside the
+# Hoenn dex. Keys and targets are case-folded names; targets missing from
+# the loaded catalog are ignored.
+EVOLUTION_OVERRIDES = {
+    "wurmple": ("silcoon", "cascoon"),
+    "nincada": ("ninjask", "shedinja"),
+    "clamperl": ("huntail", "gorebyss"),
+    "azurill": (),   # Marill
+    "nosepass": (),  # Probopass
+    "roselia": (),   # Roserade
+    "wynaut": (),    # Wobbuffet
+}
+CHUNK_ROWS = 10_000
+SNAPSHOT_VERSION = 1
+
+
+class Species:
+    """
+    One immutable row of the Hoenn catalog. A single record is shared by
+    every owner holding that species, instead of each owner keeping a dict
+    copy. The old dict keys still work with [] ("ID", "Name", "Type", "HP",
+    "Attack", "Can Evolve"), so display code and the GUI are unchanged.
+    """
+    __slots__ = ("id", "name", "type", "hp", "attack", "can_evolve")
+
+    KEYS = {"ID": "id", "Name": "name", "Type": "type",
+            "HP": "hp", "Attack": "attack"}
+
+    def __init__(self, poke_id, name, poke_type, hp, attack, can_evolve):
+        object.__setattr__(self, "id", poke_id)
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "type", poke_type)
+        object.__setattr__(self, "hp", hp)
+        object.__setattr__(self, "attack", attack)
+        object.__setattr__(self, "can_evolve", can_evolve)  # bool, parsed once
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Species records are immutable")
+
+    def __delattr__(self, key):
+        raise AttributeError("Species records are immutable")
+
+    def __getitem__(self, key):
+        if key == "Can Evolve":
+            return "TRUE" if self.can_evolve else "FALSE"
+        return getattr(self, Species.KEYS[key])
+
+    def __reduce__(self):
+        return (Species, self.as_row())
+
+    def __repr__(self):
+        return f"Species({self.id}, {self.name!r})"
+
+    def as_row(self):
+        return (self.id, self.name, self.type, self.hp, self.attack, self.can_evolve)
+
+
+class SpeciesCatalog:
+    """
+    A loaded catalog: the species list in file order plus the lookup tables
+    built once from it (see build_species_indexes).
+    """
+
+    def __init__(self, data_list):
+        self.data = data_list
+        self.by_id, self.by_name, self.by_type = build_species_indexes(data_list)
+        self.query_cache = {}  # Filter criteria -> matching species IDs
+
+    @cached_property
+    def columns(self):
+        """species_columns() of this catalog, built on first use."""
+        return species_columns(self.data)
+
+    @cached_property
+    def evolutions(self):
+        """The EvolutionGraph of this catalog, built on first use."""
+        return EvolutionGraph(self.data)
+
+    @cached_property
+    def sorted_names(self):
+        """(case-folded names in sorted order, the Species in that order)."""
+        pairs = sorted((poke.name.casefold(), poke) for poke in self.data)
+        return [name for name, _ in pairs], [poke for _, poke in pairs]
+
+    @cached_property
+    def stat_orders(self):
+        """{"hp"/"attack": (values in ascending order, the Species in that order)}; ties by ID."""
+        orders = {}
+        for stat in ("hp", "attack"):
+            species = sorted(self.data, key=lambda poke: (getattr(poke, stat), poke.id))
+            orders[stat] = ([getattr(poke, stat) for poke in species], species)
+        return orders
+
+    def species_with_prefix(self, prefix, limit=None):
+        """
+        Species whose name starts with 'prefix' (case-insensitive), in name
+        order: two binary searches plus the k results.
+        """
+        names, species = self.sorted_names
+        prefix = prefix.casefold()
+        lo = bisect_left(names, prefix)
+        hi = bisect_left(names, prefix + "\U0010ffff", lo)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return species[lo:hi]
+
+
+class EvolutionGraph:
+    """
+    Evolution lines of a catalog, precomputed in one pass:
+      successors  : ID -> tuple of Species it can evolve into (first = default)
+      predecessor : ID -> Species it evolves from
+      roots       : Species that do not evolve from anything, in catalog order
+      final_form  : ID -> last Species reached by always taking the default
+      family      : ID -> tuple of the whole line (root first, then the
+                    descendants breadth-first), shared by every member
+    """
+
+    def __init__(self, data_list, overrides=EVOLUTION_OVERRIDES):
+        by_name = {poke.name.casefold(): poke for poke in data_list}
+
+        self.successors = {}
+        self.predecessor = {}
+        for i, poke in enumerate(data_list):
+            key = poke.name.casefold()
+            if key in overrides:
+                targets = tuple(by_name[name] for name in overrides[key] if name in by_name)
+            elif poke.can_evolve and i + 1 < len(data_list) and data_list[i + 1].id == poke.id + 1:
+                targets = (data_list[i + 1],)
+            else:
+                targets = ()
+
+            if targets:
+                self.successors[poke.id] = targets
+                for target in targets:
+                    self.predecessor.setdefault(target.id, poke)
+
+        self.roots = [poke for poke in data_list if poke.id not in self.predecessor]
+
+        self.final_form = {}
+        self.family = {}
+        for root in self.roots:
+            line = [root]
+            seen = {root.id}
+            for poke in line:  # Grows while iterating: breadth-first
+                for target in self.successors.get(poke.id, ()):
+                    if target.id not in seen:
+                        seen.add(target.id)
+                        line.append(target)
+            line = tuple(line)
+            for poke in line:
+                self.family[poke.id] = line
+
+            # Members appear after their predecessor, so walking the line
+            # backwards resolves each final form from its default successor's
+            for poke in reversed(line):
+                targets = self.successors.get(poke.id)
+                self.final_form[poke.id] = self.final_form.get(targets[0].id, poke) if targets else poke
+
+    def next_form(self, poke):
+        """The default evolution of 'poke', or None."""
+        targets = self.successors.get(poke.id)
+        return targets[0] if targets else None
+
+
+def build_species_indexes(data_list):
+    """
+    Builds the lookup tables used by the helper functions:
+      by_id   : ID -> record
+      by_name : case-folded Name -> record
+      by_type : case-folded Type -> [records, in catalog order]
+    """
+    by_id = {}
+    by_name = {}
+    by_type = {}
+    for poke in data_list:
+        by_id[poke.id] = poke
+        by_name[poke.name.casefold()] = poke
+        by_type.setdefault(poke.type.casefold(), []).append(poke)
+    return by_id, by_name, by_type
+
+
+########################
+# Parsing
+########################
+
+def parse_species_row(row):
+    """
+    Turns one CSV row into a Species, raising ValueError with a readable
+    reason if the row is malformed.
+    """
+    if len(row) != len(CSV_HEADER):
+        raise ValueError(f"expected {len(CSV_HEADER)} columns, got {len(row)}")
+
+    poke_id, name, poke_type, hp, attack, can_evolve = (field.strip() for field in row)
+    values = {}
+    for column, text in (("ID", poke_id), ("HP", hp), ("Attack", attack)):
+        try:
+            values[column] = int(text)
+        except ValueError:
+            raise ValueError(f"{column} must be an integer, got {text!r}") from None
+    if values["ID"] <= 0:
+        raise ValueError(f"ID must be positive, got {values['ID']}")
+    if not name:
+        raise ValueError("Name is empty")
+    if not poke_type:
+        raise ValueError("Type is empty")
+
+    can_evolve = can_evolve.upper()
+    if can_evolve not in ("TRUE", "FALSE"):
+        raise ValueError(f"Can Evolve must be TRUE or FALSE, got {row[5]!r}")
+
+    return Species(values["ID"], name, poke_type, values["HP"], values["Attack"], can_evolve == "TRUE")
+
+
+def iter_species_chunks(filename, chunk_rows=CHUNK_ROWS, errors=None):
+    """
+    Streams the catalog CSV, yielding lists of up to 'chunk_rows' Species.
+    Blank rows are skipped. Malformed rows and duplicate IDs are skipped too
+    and, if 'errors' is a list, recorded there as (line_number, reason).
+    """
+    seen_ids = set()
+    chunk = []
+    with open(filename, mode='r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f, delimiter=',')
+        next(reader, None)  # Header row (ID,Name,Type,HP,Attack,Can Evolve)
+
+        for row in reader:
+            if not row or not any(field.strip() for field in row):
+                continue
+
+            try:
+                poke = parse_species_row(row)
+                if poke.id in seen_ids:
+                    raise ValueError(f"duplicate ID {poke.id}")
+            except ValueError as e:
+                if errors is not None:
+                    errors.append((reader.line_num, str(e)))
+                continue
+
+            seen_ids.add(poke.id)
+            chunk.append(poke)
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+
+    if chunk:
+        yield chunk
+
+
+def read_species_csv(filename, errors=None):
+    data_list = []
+    for chunk in iter_species_chunks(filename, errors=errors):
+        data_list.extend(chunk)
+    return data_list
+
+
+########################
+# Snapshot cache
+########################
+
+def snapshot_path(filename):
+    return filename + ".snapshot"
+
+
+def file_sha256(filename):
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_snapshot(path):
+    try:
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def write_snapshot(path, snapshot):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        # A read-only checkout just means no cache
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_species_catalog(filename, errors=None, use_snapshot=True):
+    """
+    Returns the catalog in 'filename' as a list of Species.
+
+    A pre-parsed snapshot is kept next to the CSV. It is reused when the
+    CSV's mtime and size are unchanged, or when they changed but the
+    content hash did not; otherwise the CSV is parsed and the snapshot
+    rewritten. Malformed rows are reported through 'errors' either way.
+    """
+    if not use_snapshot:
+        return read_species_csv(filename, errors)
+
+    stat = os.stat(filename)
+    path = snapshot_path(filename)
+    snapshot = read_snapshot(path)
+    sha256 = None
+
+    if snapshot is not None and (snapshot["mtime_ns"], snapshot["size"]) != (stat.st_mtime_ns, stat.st_size):
+        sha256 = file_sha256(filename)
+        if snapshot["sha256"] == sha256:
+            snapshot["mtime_ns"], snapshot["size"] = stat.st_mtime_ns, stat.st_size
+            write_snapshot(path, snapshot)
+        else:
+            snapshot = None
+
+    if snapshot is None:
+        row_errors = []
+        data_list = read_species_csv(filename, row_errors)
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": sha256 or file_sha256(filename),
+            "rows": [poke.as_row() for poke in data_list],
+            "errors": row_errors,
+        }
+        write_snapshot(path, snapshot)
+    else:
+        data_list = [Species(*row) for row in snapshot["rows"]]
+
+    if errors is not None:
+        errors.extend(snapshot["errors"])
+    return data_list
+
+
+########################
+# Column arrays
+########################
+
+def optional_numpy():
+    """Returns the numpy module, or None if it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def species_columns(data_list):
+    """
+    Column-wise view of the catalog for vectorised queries:
+      "id", "hp", "attack" : integer arrays, one entry per species
+      "type_code"          : integer code into "type_names"
+      "can_evolve"         : 0/1 (bool array with NumPy)
+      "type_names"         : list of the distinct case-folded types, in
+                             first-seen order
+    The arrays are NumPy arrays if NumPy is installed, else array.array.
+    """
+    np = optional_numpy()
+    type_codes = {}
+    for poke in data_list:
+        type_codes.setdefault(poke.type.casefold(), len(type_codes))
+
+    ids = [poke.id for poke in data_list]
+    hps = [poke.hp for poke in data_list]
+    attacks = [poke.attack for poke in data_list]
+    codes = [type_codes[poke.type.casefold()] for poke in data_list]
+    evolves = [poke.can_evolve for poke in data_list]
+
+    if np is not None:
+        columns = {
+            "id": np.array(ids, dtype=np.int64),
+            "hp": np.array(hps, dtype=np.int64),
+            "attack": np.array(attacks, dtype=np.int64),
+            "type_code": np.array(codes, dtype=np.int32),
+            "can_evolve": np.array(evolves, dtype=bool),
+        }
+    else:
+        columns = {
+            "id": array("q", ids),
+            "hp": array("q", hps),
+            "attack": array("q", attacks),
+            "type_code": array("i", codes),
+            "can_evolve": array("b", evolves),
+        }
+    columns["type_names"] = list(type_codes)
+    return columns